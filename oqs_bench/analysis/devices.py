@@ -0,0 +1,145 @@
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+import yaml
+
+DEFAULT_STORE = Path("oqs_bench/testing/results/devices.csv")
+
+
+def _time_columns(data: pd.DataFrame) -> List[str]:
+    # Only these hold process CPU time in nanoseconds, not e.g. 'KEM Share of Seal Time'
+    return [
+        column for column in data.columns
+        if (column.startswith('Mean ') or column.startswith('p99 ')) and column.endswith(' Time')
+        or column.endswith(' Time Standard Deviation')
+    ]
+
+
+def load_bundle(bundle: Path, device: str = None, frequency_mhz: float = None) -> pd.DataFrame:
+    # A bundle is one device's results directory: device.yml plus one folder of CSVs per kind
+    description = {}
+    if (bundle / 'device.yml').exists():
+        description = yaml.safe_load(open(bundle / 'device.yml', 'r')) or {}
+    device = device or bundle.name
+    frequency_source = 'override' if frequency_mhz else description.get('cpu_frequency_source', 'maximum')
+    frequency_mhz = frequency_mhz or description.get('cpu_frequency_mhz')
+    if frequency_mhz is None:
+        raise ValueError(f"No CPU frequency recorded for {device}, pass one explicitly")
+
+    frames = []
+    for _file in sorted(bundle.glob('*/*.csv')):
+        frame = pd.read_csv(_file, index_col=0)
+        frame.index = frame.index.map(str)
+        frame = frame.rename_axis('Variant').reset_index()
+        frame.insert(0, 'Algorithm', _file.stem)
+        frame.insert(0, 'Kind', _file.parent.name)
+        frame.insert(0, 'Device', device)
+        frames.append(frame)
+    data = pd.concat(frames, ignore_index=True)
+    data['Machine'] = description.get('machine')
+    data['CPU Frequency (MHz)'] = frequency_mhz
+    data['CPU Frequency Source'] = frequency_source
+    return normalize(data)
+
+
+def normalize(data: pd.DataFrame) -> pd.DataFrame:
+    # ns * MHz / 1000 = cycles
+    for column in _time_columns(data):
+        data[column.replace(' Time', ' Cycles', 1)] = data[column] * data['CPU Frequency (MHz)'] / 1_000
+    return data
+
+
+def import_bundles(store: Path, bundles: List[Path], frequencies: Dict[str, float] = None, devices: Dict[Path, str] = None) -> pd.DataFrame:
+    frequencies = frequencies or {}
+    devices = devices or {}
+    imported = []
+    for bundle in bundles:
+        device = devices.get(bundle, bundle.name)
+        imported.append(load_bundle(bundle, device=device, frequency_mhz=frequencies.get(device)))
+    data = pd.concat(imported, ignore_index=True)
+    if store.exists():
+        existing = pd.read_csv(store)
+        # Re-importing a device replaces its previous results
+        existing = existing[~existing['Device'].isin(data['Device'].unique())]
+        data = pd.concat([existing, data], ignore_index=True)
+    store.parent.mkdir(parents=True, exist_ok=True)
+    data.to_csv(store, index=False)
+    return data
+
+
+def compare(data: pd.DataFrame, kind: str, metric: str, reference: str = None) -> pd.DataFrame:
+    subset = data[data['Kind'] == kind]
+    table = subset.pivot_table(index=['Algorithm', 'Variant'], columns='Device', values=metric, aggfunc='mean')
+    reference = reference or table.mean().idxmin()
+    # How many times slower (or more cycles) each device is than the reference
+    for device in table.columns.drop(reference):
+        table[f'{device} / {reference}'] = table[device] / table[reference]
+    return table
+
+
+def plot(data: pd.DataFrame, kind: str, metric: str, output: Path) -> None:
+    import seaborn as sns
+    from matplotlib import pyplot as plt
+
+    subset = data[data['Kind'] == kind].sort_values(by=metric)
+    sns.set_style("whitegrid")
+    fig, ax = plt.subplots(figsize=(20, max(10, len(subset['Variant'].unique()) * 0.4)))
+    sns.barplot(y="Variant", x=metric, hue="Device", data=subset, ax=ax, palette="mako")
+    ax.set(xlabel=metric, ylabel=kind.upper())
+    ax.legend().set(title="Device")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate benchmark results across devices.")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Import device result bundles into the store")
+    import_parser.add_argument("bundles", type=Path, nargs='+')
+    import_parser.add_argument("--frequency", action='append', default=[], metavar="DEVICE=MHZ", help="Override a device's CPU frequency")
+    import_parser.add_argument("--device", action='append', default=[], help="Device name for each bundle in order, "
+                               "instead of the bundle's directory name (needed for the local testing/results)")
+
+    compare_parser = commands.add_parser("compare", help="Print a cross-device comparison table")
+    compare_parser.add_argument("--kind", default="kem")
+    compare_parser.add_argument("--metric", default="Mean Encapsulation Cycles")
+    compare_parser.add_argument("--reference", help="Device the others are compared against")
+    compare_parser.add_argument("--output", type=Path, help="Write the table to a CSV file")
+
+    plot_parser = commands.add_parser("plot", help="Plot a metric per variant for every device")
+    plot_parser.add_argument("--kind", default="kem")
+    plot_parser.add_argument("--metric", default="Mean Encapsulation Cycles")
+    plot_parser.add_argument("output", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "import":
+        frequencies = {device: float(mhz) for device, mhz in (frequency.split('=') for frequency in args.frequency)}
+        if len(args.device) > len(args.bundles):
+            parser.error("More --device names than bundles")
+        data = import_bundles(args.store, args.bundles, frequencies, dict(zip(args.bundles, args.device)))
+        print(data.groupby(['Device', 'Kind']).size())
+        return
+
+    data = pd.read_csv(args.store)
+    if args.command == "compare":
+        table = compare(data, args.kind, args.metric, args.reference)
+        with pd.option_context('display.max_rows', None, 'display.width', None):
+            print(table)
+        if args.metric.endswith(' Cycles'):
+            # Stores imported before the source was recorded used the maximum unless overridden
+            sources = data.drop_duplicates('Device').set_index('Device').reindex(columns=['CPU Frequency Source'])
+            sources = sources['CPU Frequency Source'].fillna('maximum')
+            print("\nCycles are computed from a fixed clock rate per device, not the one measured during the run, "
+                  "so throttled runs overcount them: " + ', '.join(f'{device}: {source}' for device, source in sources.items()))
+        if args.output:
+            table.to_csv(args.output)
+    elif args.command == "plot":
+        plot(data, args.kind, args.metric, args.output)
+
+
+if __name__ == '__main__':
+    main()
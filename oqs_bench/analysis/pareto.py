@@ -0,0 +1,144 @@
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from oqs_bench.testing.plan import algorithm_runners, get_nist_level
+
+# Latencies are minimised, throughputs maximised, sizes minimised
+KEM_METRICS = {
+    'latency': {
+        'Mean Keygen Time': 'keygen',
+        'Mean Encapsulation Time': 'encaps',
+        'Mean Decapsulation Time': 'decaps',
+    },
+    'throughput': ['Encapsulations Per Second', 'Decapsulations Per Second'],
+    'size': ['Public Key length', 'Ciphertext length'],
+}
+
+SIGN_METRICS = {
+    'latency': {
+        'Mean Keygen Time': 'keygen',
+        # Signing times are stored under the KEM column name
+        'Mean Encapsulation Time': 'sign',
+        'Mean Verification Time': 'verify',
+    },
+    'throughput': ['Signatures Per Second', 'Verifications Per Second'],
+    'size': ['Public Key length', 'Signature length'],
+}
+
+METRICS = {
+    'kem': KEM_METRICS,
+    'sign': SIGN_METRICS,
+}
+
+# Operations per connection; KEM keys are ephemeral, signing keys are long-term
+DEFAULT_WEIGHTS = {
+    'kem': {'keygen': 1.0, 'encaps': 1.0, 'decaps': 1.0},
+    'sign': {'keygen': 0.0, 'sign': 1.0, 'verify': 1.0},
+}
+OPERATIONS = ['keygen', 'encaps', 'decaps', 'sign', 'verify']
+
+
+def load_results(results_dir: Path, kind: str) -> pd.DataFrame:
+    frames = []
+    for _file in sorted((results_dir / kind).glob('*.csv')):
+        frame = pd.read_csv(_file, index_col=0)
+        frame['Algorithm'] = _file.stem
+        frames.append(frame)
+    data = pd.concat(frames)
+    data.index = data.index.map(str)
+    runners = algorithm_runners(kind)
+    data["Claimed NIST Level"] = [get_nist_level(kind, variant, runners.get(algorithm))
+                                  for variant, algorithm in zip(data.index, data['Algorithm'])]
+    return data
+
+
+def pareto_front(data: pd.DataFrame, kind: str) -> pd.Series:
+    metrics = METRICS[kind]
+    # Negate throughputs so every objective is minimised
+    objectives = pd.concat([
+        data[list(metrics['latency'])],
+        -data[metrics['throughput']],
+        data[metrics['size']],
+    ], axis=1).to_numpy()
+    optimal = []
+    for candidate in objectives:
+        dominated = ((objectives <= candidate).all(axis=1) & (objectives < candidate).any(axis=1)).any()
+        optimal.append(not dominated)
+    return pd.Series(optimal, index=data.index)
+
+
+def cost(data: pd.DataFrame, kind: str, weights: Dict[str, float], link_cost: float) -> pd.Series:
+    # Cost in microseconds: weighted CPU time plus wire bytes at link_cost us/byte
+    metrics = METRICS[kind]
+    cpu_cost = sum(data[column] / 1_000 * weights[operation] for column, operation in metrics['latency'].items())
+    wire_cost = data[metrics['size']].sum(axis=1) * link_cost
+    return cpu_cost + wire_cost
+
+
+def recommend(data: pd.DataFrame, kind: str, weights: Dict[str, float], link_cost: float, constraints: Dict[str, float] = None, levels: List[str] = None) -> pd.DataFrame:
+    data = data.copy()
+    if levels:
+        data = data[data["Claimed NIST Level"].isin(levels)]
+    for column, maximum in (constraints or {}).items():
+        data = data[data[column] <= maximum]
+
+    data['Cost'] = cost(data, kind, weights, link_cost)
+    data['Pareto Optimal'] = False
+    for level, group in data.groupby("Claimed NIST Level"):
+        # Variants of unknown level are listed, but not ranked against each other as if comparable
+        if level == "Unknown":
+            continue
+        data.loc[group.index, 'Pareto Optimal'] = pareto_front(group, kind)
+    data = data.sort_values(by=["Claimed NIST Level", "Pareto Optimal", "Cost"], ascending=[True, False, True])
+    data['Rank'] = data.groupby("Claimed NIST Level").cumcount() + 1
+
+    metrics = METRICS[kind]
+    columns = ['Algorithm', "Claimed NIST Level", 'Rank', 'Pareto Optimal', 'Cost'] + list(metrics['latency']) + metrics['throughput'] + metrics['size']
+    return data[columns]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank Pareto-optimal schemes per NIST level.")
+    parser.add_argument("results", type=Path, help="Device results directory, e.g. oqs_bench/testing/results/pi")
+    parser.add_argument("--kind", choices=METRICS, default='kem')
+    parser.add_argument("--level", action='append', dest='levels', help="Only consider these NIST levels")
+    parser.add_argument("--link-cost", type=float, default=0.0, help="Cost of one byte on the wire in microseconds")
+    for operation in OPERATIONS:
+        parser.add_argument(f"--{operation}-weight", type=float, help=f"{operation} operations per connection")
+    parser.add_argument("--max-public-key", type=float, help="Maximum public key length in bytes")
+    parser.add_argument("--max-wire", type=float, help="Maximum ciphertext or signature length in bytes")
+    parser.add_argument("--max-latency", type=float, help="Maximum latency of any operation in microseconds")
+    parser.add_argument("--top", type=int, help="Only show the best N schemes per level")
+    parser.add_argument("--output", type=Path, help="Write the recommendation to a CSV file")
+    args = parser.parse_args()
+
+    metrics = METRICS[args.kind]
+    constraints = {}
+    if args.max_public_key is not None:
+        constraints['Public Key length'] = args.max_public_key
+    if args.max_wire is not None:
+        constraints[metrics['size'][1]] = args.max_wire
+    if args.max_latency is not None:
+        for column in metrics['latency']:
+            constraints[column] = args.max_latency * 1_000
+
+    weights = dict(DEFAULT_WEIGHTS[args.kind])
+    for operation in weights:
+        if getattr(args, f"{operation}_weight") is not None:
+            weights[operation] = getattr(args, f"{operation}_weight")
+    data = load_results(args.results, args.kind)
+    ranking = recommend(data, args.kind, weights, args.link_cost, constraints, args.levels)
+    if args.top:
+        ranking = ranking[ranking['Rank'] <= args.top]
+
+    with pd.option_context('display.max_rows', None, 'display.width', None):
+        print(ranking)
+    if args.output:
+        ranking.to_csv(args.output)
+
+
+if __name__ == '__main__':
+    main()
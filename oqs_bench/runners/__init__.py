@@ -1,4 +1,15 @@
-from .kem import KEMRunner
-from .sign import SignRunner
+import importlib
 
-__all__ = [KEMRunner, SignRunner]
\ No newline at end of file
+__all__ = ['KEMRunner', 'SignRunner']
+
+# Importing one runner module should not load liboqs and cryptography for all of them
+_LAZY = {
+    'KEMRunner': '.kem',
+    'SignRunner': '.sign',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from hashlib import sha256
+from typing import List, Optional, Tuple
+
+from .sign import SignRunner, Plaintext, Signature, KeyPair
+from .utils import current_milli_time
+
+Digest = bytes
+# (leaf index, sibling digests from the leaf up to the root)
+InclusionProof = Tuple[int, List[Digest]]
+# (merkle root, batch size, signature over the root)
+BatchSignature = Tuple[Digest, int, Signature]
+
+# Domain separation between leaves and inner nodes (RFC 6962)
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+DIGEST_SIZE = sha256().digest_size
+INDEX_SIZE = 4
+
+
+def hash_leaf(message: Plaintext) -> Digest:
+    return sha256(LEAF_PREFIX + message).digest()
+
+
+def hash_node(left: Digest, right: Digest) -> Digest:
+    return sha256(NODE_PREFIX + left + right).digest()
+
+
+def build_tree(leaves: List[Digest]) -> List[List[Digest]]:
+    # An odd node at the end of a level is promoted unchanged to the next level
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [hash_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def inclusion_proof(levels: List[List[Digest]], index: int) -> InclusionProof:
+    path = []
+    position = index
+    for level in levels[:-1]:
+        sibling = position ^ 1
+        if sibling < len(level):
+            path.append(level[sibling])
+        position //= 2
+    return index, path
+
+
+def root_from_proof(leaf: Digest, proof: InclusionProof, batch_size: int) -> Optional[Digest]:
+    index, path = proof
+    if not 0 <= index < batch_size:
+        return None
+    node = leaf
+    position = index
+    width = batch_size
+    siblings = iter(path)
+    while width > 1:
+        if position ^ 1 < width:
+            sibling = next(siblings, None)
+            if sibling is None:
+                return None
+            node = hash_node(sibling, node) if position % 2 else hash_node(node, sibling)
+        position //= 2
+        width = (width + 1) // 2
+    if next(siblings, None) is not None:
+        return None
+    return node
+
+
+def signed_payload(root: Digest, batch_size: int) -> bytes:
+    # The batch size is committed to so that proofs cannot be replayed against a differently shaped tree
+    return root + batch_size.to_bytes(INDEX_SIZE, 'big')
+
+
+def proof_length(proof: InclusionProof) -> int:
+    return INDEX_SIZE + DIGEST_SIZE * len(proof[1])
+
+
+class BatchSignRunner:
+    ROOT_CACHE_SIZE = 1024
+
+    def __init__(self, runner: SignRunner) -> None:
+        self.runner = runner
+        self.algorithm = runner.algorithm
+        self.variant = runner.variant
+        self._root_cache = OrderedDict()
+
+    def generate_key(self) -> KeyPair:
+        keypair = self.runner.generate_key()
+        self.keygen_time = self.runner.keygen_time
+        return keypair
+
+    def sign_batch(self, secret_key: bytes, plaintexts: List[Plaintext]) -> Tuple[BatchSignature, List[InclusionProof]]:
+        if not plaintexts:
+            raise ValueError("Cannot sign an empty batch")
+        start = current_milli_time()
+        levels = build_tree([hash_leaf(plaintext) for plaintext in plaintexts])
+        root = levels[-1][0]
+        signature = self.runner.sign(secret_key, signed_payload(root, len(plaintexts)))
+        proofs = [inclusion_proof(levels, i) for i in range(len(plaintexts))]
+        end = current_milli_time()
+        self.sign_time = end - start
+        return (root, len(plaintexts), signature), proofs
+
+    def verify(self, public_key: bytes, plaintext: Plaintext, proof: InclusionProof, batch_signature: BatchSignature) -> bool:
+        start = current_milli_time()
+        root, batch_size, signature = batch_signature
+        valid = root_from_proof(hash_leaf(plaintext), proof, batch_size) == root and self._verify_root(public_key, batch_signature)
+        end = current_milli_time()
+        self.verify_time = end - start
+        return valid
+
+    def clear_cache(self) -> None:
+        self._root_cache.clear()
+
+    def _verify_root(self, public_key: bytes, batch_signature: BatchSignature) -> bool:
+        key = (public_key, batch_signature)
+        if key in self._root_cache:
+            self._root_cache.move_to_end(key)
+            return self._root_cache[key]
+        root, batch_size, signature = batch_signature
+        valid = bool(self.runner.verify(public_key, signed_payload(root, batch_size), signature))
+        self._root_cache[key] = valid
+        if len(self._root_cache) > self.ROOT_CACHE_SIZE:
+            self._root_cache.popitem(last=False)
+        return valid
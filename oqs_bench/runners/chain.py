@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from hashlib import sha256
+from typing import Dict, List, NamedTuple, Tuple
+
+from .sign import SignRunner
+from .utils import current_milli_time
+
+LENGTH_SIZE = 4
+
+
+def _encode_fields(*fields: bytes) -> bytes:
+    return b''.join(len(field).to_bytes(LENGTH_SIZE, 'big') + field for field in fields)
+
+
+class Certificate(NamedTuple):
+    # A minimal X.509-like certificate; `cryptography` cannot build real X.509 with PQ keys
+    subject: str
+    issuer: str
+    public_key_algorithm: str
+    signature_algorithm: str
+    public_key: bytes
+    signature: bytes = b''
+
+    @property
+    def tbs(self) -> bytes:
+        return _encode_fields(
+            self.subject.encode(),
+            self.issuer.encode(),
+            self.public_key_algorithm.encode(),
+            self.signature_algorithm.encode(),
+            self.public_key
+        )
+
+    def encode(self) -> bytes:
+        return self.tbs + _encode_fields(self.signature)
+
+    def fingerprint(self) -> bytes:
+        return sha256(self.encode()).digest()
+
+
+class CertificateChainBuilder:
+    def __init__(self, levels: List[Tuple[str, SignRunner]]) -> None:
+        # Levels run from the root to the leaf
+        self.levels = levels
+        self.runners = dict(levels)
+        self.secret_keys = []
+
+    def _issue(self, subject: str, algorithm: str, public_key: bytes, issuer: Certificate, issuer_secret_key: bytes) -> Certificate:
+        certificate = Certificate(subject, issuer.subject, algorithm, issuer.public_key_algorithm, public_key)
+        signature = self.runners[issuer.public_key_algorithm].sign(issuer_secret_key, certificate.tbs)
+        return certificate._replace(signature=signature)
+
+    def build(self) -> List[Certificate]:
+        # The chain is returned leaf first, as it would be sent on the wire
+        chain = []
+        self.secret_keys = []
+        for depth, (algorithm, runner) in enumerate(self.levels):
+            public_key, secret_key = runner.generate_key()
+            subject = f'CN=level-{depth}'
+            if not chain:
+                issuer = Certificate(subject, subject, algorithm, algorithm, public_key)
+                issuer_secret_key = secret_key
+            else:
+                issuer, issuer_secret_key = chain[-1], self.secret_keys[-1]
+            chain.append(self._issue(subject, algorithm, public_key, issuer, issuer_secret_key))
+            self.secret_keys.append(secret_key)
+        self.chain = chain[::-1]
+        return self.chain
+
+    def issue_leaf(self) -> List[Certificate]:
+        # A fresh leaf under the existing intermediates, as issued for a new server
+        algorithm, runner = self.levels[-1]
+        public_key, _ = runner.generate_key()
+        leaf = self._issue(self.chain[0].subject, algorithm, public_key, self.chain[1], self.secret_keys[-2])
+        return [leaf] + self.chain[1:]
+
+
+class ChainVerifier:
+    CACHE_SIZE = 1024
+
+    def __init__(self, runners: Dict[str, SignRunner], trusted_roots: List[Certificate], cache: bool = True) -> None:
+        self.runners = runners
+        self.trusted_roots = {root.fingerprint() for root in trusted_roots}
+        self.cache = cache
+        # Issuer fingerprint -> {subject fingerprint: verified}
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _verify_signature(self, certificate: Certificate, issuer: Certificate) -> bool:
+        if certificate.issuer != issuer.subject or certificate.signature_algorithm != issuer.public_key_algorithm:
+            return False
+        runner = self.runners[certificate.signature_algorithm]
+        return bool(runner.verify(issuer.public_key, certificate.tbs, certificate.signature))
+
+    def _verify_cached(self, certificate: Certificate, issuer: Certificate) -> bool:
+        issuer_fingerprint = issuer.fingerprint()
+        subject_fingerprint = certificate.fingerprint()
+        verified = self._cache.get(issuer_fingerprint, {})
+        if subject_fingerprint in verified:
+            self.hits += 1
+            self._cache.move_to_end(issuer_fingerprint)
+            return verified[subject_fingerprint]
+        self.misses += 1
+        valid = self._verify_signature(certificate, issuer)
+        self._cache.setdefault(issuer_fingerprint, {})[subject_fingerprint] = valid
+        self._cache.move_to_end(issuer_fingerprint)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return valid
+
+    def verify(self, chain: List[Certificate]) -> bool:
+        start = current_milli_time()
+        valid = chain[-1].fingerprint() in self.trusted_roots
+        for depth, (certificate, issuer) in enumerate(zip(chain, chain[1:])):
+            if not valid:
+                break
+            # Leaves change per connection, so only CA-issued intermediates are worth caching
+            if self.cache and depth > 0:
+                valid = self._verify_cached(certificate, issuer)
+            else:
+                valid = self._verify_signature(certificate, issuer)
+        end = current_milli_time()
+        self.verify_time = end - start
+        return valid
+
+
+def chain_length(chain: List[Certificate]) -> int:
+    # The trusted root is not sent on the wire
+    return sum(len(certificate.encode()) for certificate in chain[:-1])
@@ -0,0 +1,136 @@
+import mmap
+import struct
+from collections import OrderedDict
+from hashlib import blake2b
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+from .utils import current_milli_time
+
+KeyID = bytes
+PublicKey = Union[bytes, memoryview]
+
+# File layout: header, open-addressing hash table, then the keys back to back
+MAGIC = b'OQSKEYS1'
+# (magic, table slots, stored keys)
+HEADER = struct.Struct('<8sQQ')
+# (key id digest, offset in the file, key length); a zero length marks an empty slot
+SLOT = struct.Struct('<16sQI')
+DIGEST_SIZE = 16
+
+
+def _digest(key_id: KeyID) -> bytes:
+    return blake2b(key_id, digest_size=DIGEST_SIZE).digest()
+
+
+def _slots(count: int) -> int:
+    # A power of two at least twice the number of keys keeps probe sequences short
+    return 1 << max(1, (2 * count - 1).bit_length())
+
+
+def directory_size(count: int, key_size: int) -> int:
+    # File size of a directory holding count keys of key_size bytes
+    return HEADER.size + _slots(count) * SLOT.size + count * key_size
+
+
+class PublicKeyDirectory:
+    # Public keys in a memory-mapped file, returned as views into the mapping rather than copies
+    def __init__(self, path: Path, cache_size: int = 0) -> None:
+        self.path = Path(path)
+        self.file = open(self.path, 'rb')
+        self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mapping)
+        magic, self.slots, self.count = HEADER.unpack_from(self.mapping, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a public key directory")
+        # Hot keys are kept in memory as bytes, most recently used last
+        self.cache_size = cache_size
+        self.cache: 'OrderedDict[bytes, bytes]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def create(cls, path: Path, keys: Iterable[Tuple[KeyID, bytes]], count: int, cache_size: int = 0) -> 'PublicKeyDirectory':
+        # Keys are streamed to disk, only the hash table is held in memory while building
+        slots = _slots(count)
+        data_offset = HEADER.size + slots * SLOT.size
+        stored = 0
+        with open(path, 'w+b') as f:
+            f.truncate(data_offset)
+            with mmap.mmap(f.fileno(), data_offset) as table:
+                f.seek(data_offset)
+                offset = data_offset
+                for key_id, public_key in keys:
+                    if stored == count:
+                        raise ValueError(f"More than {count} keys given")
+                    digest = _digest(key_id)
+                    slot = cls._probe(table, slots, digest)
+                    if SLOT.unpack_from(table, slot)[2]:
+                        raise ValueError(f"Duplicate key id {key_id.hex()}")
+                    SLOT.pack_into(table, slot, digest, offset, len(public_key))
+                    offset += f.write(public_key)
+                    stored += 1
+                HEADER.pack_into(table, 0, MAGIC, slots, stored)
+        return cls(path, cache_size)
+
+    @staticmethod
+    def _probe(table, slots: int, digest: bytes) -> int:
+        # Position of the slot holding digest, or of the empty slot ending its probe sequence
+        mask = slots - 1
+        index = int.from_bytes(digest[:8], 'little') & mask
+        while True:
+            position = HEADER.size + index * SLOT.size
+            stored, _, length = SLOT.unpack_from(table, position)
+            if not length or stored == digest:
+                return position
+            index = (index + 1) & mask
+
+    def _locate(self, digest: bytes) -> Optional[Tuple[int, int]]:
+        _, offset, length = SLOT.unpack_from(self.mapping, self._probe(self.mapping, self.slots, digest))
+        return (offset, length) if length else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, key_id: KeyID) -> bool:
+        return self._locate(_digest(key_id)) is not None
+
+    def get(self, key_id: KeyID) -> PublicKey:
+        start = current_milli_time()
+        digest = _digest(key_id)
+        public_key = self.cache.get(digest)
+        if public_key is not None:
+            self.cache.move_to_end(digest)
+            self.hits += 1
+        else:
+            location = self._locate(digest)
+            if location is None:
+                raise KeyError(key_id)
+            offset, length = location
+            public_key = self.view[offset:offset + length]
+            if self.cache_size:
+                self.misses += 1
+                public_key = bytes(public_key)
+                self.cache[digest] = public_key
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        end = current_milli_time()
+        self.lookup_time = end - start
+        return public_key
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self) -> None:
+        # Views handed out by get() must be released first
+        self.cache.clear()
+        self.view.release()
+        self.mapping.close()
+        self.file.close()
+
+    def __enter__(self) -> 'PublicKeyDirectory':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,125 @@
+import mmap
+from hashlib import sha256
+from typing import BinaryIO, Iterator, Tuple, Union
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+
+from .kem import KEMRunner
+from .utils import current_milli_time
+
+Source = Union[BinaryIO, bytes, memoryview, mmap.mmap]
+
+AEADS = {
+    'AES-256-GCM': AESGCM,
+    'ChaCha20-Poly1305': ChaCha20Poly1305
+}
+
+INFO = b'oqs_bench hybrid v1'
+KEY_SIZE = 32
+NONCE_SIZE = 12
+TAG_SIZE = 16
+LENGTH_SIZE = 4
+SEQUENCE_SIZE = 8
+
+# Additional data marking the final chunk, so truncated streams fail to open
+CHUNK_AAD = b'\x00'
+FINAL_CHUNK_AAD = b'\x01'
+
+
+def _read_exact(reader: BinaryIO, size: int) -> bytes:
+    data = reader.read(size)
+    if len(data) != size:
+        raise InvalidTag()
+    return data
+
+
+def _iter_chunks(source: Source, chunk_size: int) -> Iterator[Tuple[bytes, bool]]:
+    # Yields (chunk, is_final); buffers (including mmaps, which also have read()) are sliced without copying,
+    # streams hold at most two chunks in memory
+    if isinstance(source, (bytes, memoryview, mmap.mmap)):
+        view = memoryview(source)
+        for offset in range(0, max(len(view), 1), chunk_size):
+            yield view[offset:offset + chunk_size], offset + chunk_size >= len(view)
+    else:
+        chunk = source.read(chunk_size)
+        while True:
+            following = source.read(chunk_size)
+            yield chunk, not following
+            if not following:
+                return
+            chunk = following
+
+
+class HybridEncryptionRunner:
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, runner: KEMRunner, aead: str = 'AES-256-GCM', chunk_size: int = CHUNK_SIZE) -> None:
+        self.runner = runner
+        self.algorithm = runner.algorithm
+        self.variant = runner.variant
+        self.aead = aead
+        self.chunk_size = chunk_size
+
+    def generate_key(self):
+        keypair = self.runner.generate_key()
+        self.keygen_time = self.runner.keygen_time
+        return keypair
+
+    def _key_schedule(self, shared_secret: bytes, encapsulated_key: bytes) -> Tuple[object, bytes]:
+        okm = HKDF(
+            algorithm=hashes.SHA256(),
+            length=KEY_SIZE + NONCE_SIZE,
+            salt=None,
+            info=INFO + self.aead.encode() + sha256(encapsulated_key).digest()
+        ).derive(shared_secret)
+        return AEADS[self.aead](okm[:KEY_SIZE]), okm[KEY_SIZE:]
+
+    @staticmethod
+    def _nonce(base_nonce: bytes, sequence: int) -> bytes:
+        return (int.from_bytes(base_nonce, 'big') ^ sequence).to_bytes(NONCE_SIZE, 'big')
+
+    def seal(self, public_key: bytes, source: Source, writer: BinaryIO) -> int:
+        start = current_milli_time()
+        encapsulated_key, shared_secret = self.runner.encapsulate(public_key)
+        self.encrypt_time = self.runner.encrypt_time
+        cipher, base_nonce = self._key_schedule(shared_secret, encapsulated_key)
+        written = writer.write(len(encapsulated_key).to_bytes(LENGTH_SIZE, 'big'))
+        written += writer.write(encapsulated_key)
+        for sequence, (chunk, final) in enumerate(_iter_chunks(source, self.chunk_size)):
+            aad = FINAL_CHUNK_AAD if final else CHUNK_AAD
+            written += writer.write(cipher.encrypt(self._nonce(base_nonce, sequence), chunk, aad))
+        end = current_milli_time()
+        self.seal_time = end - start
+        return written
+
+    def open(self, secret_key: bytes, reader: BinaryIO, writer: BinaryIO) -> int:
+        start = current_milli_time()
+        length = int.from_bytes(_read_exact(reader, LENGTH_SIZE), 'big')
+        encapsulated_key = _read_exact(reader, length)
+        shared_secret = self.runner.decapsulate(secret_key, encapsulated_key)
+        self.decrypt_time = self.runner.decrypt_time
+        cipher, base_nonce = self._key_schedule(shared_secret, encapsulated_key)
+        written = 0
+        for sequence, (chunk, final) in enumerate(_iter_chunks(reader, self.chunk_size + TAG_SIZE)):
+            aad = FINAL_CHUNK_AAD if final else CHUNK_AAD
+            written += writer.write(cipher.decrypt(self._nonce(base_nonce, sequence), chunk, aad))
+        end = current_milli_time()
+        self.open_time = end - start
+        return written
+
+    def seal_file(self, public_key: bytes, in_path: str, out_path: str) -> int:
+        with open(in_path, 'rb') as source, open(out_path, 'wb') as writer:
+            try:
+                mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return self.seal(public_key, source, writer)
+            with mapped:
+                return self.seal(public_key, mapped, writer)
+
+    def open_file(self, secret_key: bytes, in_path: str, out_path: str) -> int:
+        with open(in_path, 'rb') as reader, open(out_path, 'wb') as writer:
+            return self.open(secret_key, reader, writer)
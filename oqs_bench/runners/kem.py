@@ -47,6 +47,8 @@ class OQSKEMRunner(KEMRunner):
         return public_key, secret_key
     
     def encapsulate(self, public_key: bytes) -> Tuple[Ciphertext, SharedSecret]:
+        # Keys from a PublicKeyDirectory are memoryviews, liboqs-python only takes bytes
+        public_key = bytes(public_key)
         with oqs.KeyEncapsulation(self.system) as client:
             start = current_milli_time()
             ciphertext, shared_secret = client.encap_secret(public_key)
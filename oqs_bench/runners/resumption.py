@@ -0,0 +1,121 @@
+import os
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Optional, Tuple
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from .kem import KEMRunner
+from .utils import current_milli_time
+
+TicketID = bytes
+SessionKey = bytes
+# (ticket id, resumption secret) as held by the client
+Ticket = Tuple[TicketID, bytes]
+
+KEY_SIZE = 32
+TICKET_ID_SIZE = 16
+NONCE_SIZE = 32
+
+SESSION_INFO = b'oqs_bench session'
+RESUMPTION_INFO = b'oqs_bench resumption'
+
+
+def _derive(secret: bytes, info: bytes, salt: bytes = None) -> bytes:
+    return HKDF(algorithm=hashes.SHA256(), length=KEY_SIZE, salt=salt, info=info).derive(secret)
+
+
+class TicketCache:
+    # Server-side resumption secrets, bounded in size and lifetime
+    def __init__(self, capacity: int, lifetime: float, clock: Callable[[], float] = monotonic) -> None:
+        self.capacity = capacity
+        self.lifetime = lifetime
+        self.clock = clock
+        # ticket id -> (resumption secret, expiry), oldest first
+        self.entries: 'OrderedDict[TicketID, Tuple[bytes, float]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _expire(self, now: float) -> None:
+        # Every ticket gets the same lifetime, so the oldest entries expire first
+        while self.entries:
+            _, (_, expiry) = next(iter(self.entries.items()))
+            if expiry > now:
+                return
+            self.entries.popitem(last=False)
+            self.expirations += 1
+
+    def put(self, ticket_id: TicketID, secret: bytes) -> None:
+        now = self.clock()
+        self._expire(now)
+        while len(self.entries) >= self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[ticket_id] = (secret, now + self.lifetime)
+
+    def pop(self, ticket_id: TicketID) -> Optional[bytes]:
+        # Tickets are single use, redeeming one removes it
+        self._expire(self.clock())
+        entry = self.entries.pop(ticket_id, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def hit_rate(self) -> float:
+        attempts = self.hits + self.misses
+        return self.hits / attempts if attempts else 0.0
+
+
+class ResumptionRunner:
+    # KEM handshakes whose shared secret seeds a ticket, so later connections can skip the KEM (like a TLS 1.3 PSK)
+    def __init__(self, runner: KEMRunner, cache: TicketCache) -> None:
+        self.runner = runner
+        self.algorithm = runner.algorithm
+        self.variant = runner.variant
+        self.cache = cache
+        self.resumed = False
+
+    def _issue(self, secret: bytes) -> Ticket:
+        # Client and server derive the same resumption secret, only its id goes over the wire
+        ticket_id = os.urandom(TICKET_ID_SIZE)
+        resumption_secret = _derive(secret, RESUMPTION_INFO)
+        self.cache.put(ticket_id, resumption_secret)
+        return ticket_id, resumption_secret
+
+    def full_handshake(self) -> Tuple[SessionKey, Ticket]:
+        start = current_milli_time()
+        # The client's key pair is ephemeral, as in KEMTLS
+        public_key, secret_key = self.runner.generate_key()
+        ciphertext, server_secret = self.runner.encapsulate(public_key)
+        client_secret = self.runner.decapsulate(secret_key, ciphertext)
+        assert client_secret == server_secret
+        session_key = _derive(server_secret, SESSION_INFO)
+        ticket = self._issue(server_secret)
+        end = current_milli_time()
+        self.full_handshake_time = end - start
+        self.resumed = False
+        return session_key, ticket
+
+    def resume(self, ticket: Ticket) -> Tuple[SessionKey, Ticket]:
+        # Falls back to a full handshake when the ticket has expired or was evicted
+        start = current_milli_time()
+        ticket_id, client_secret = ticket
+        server_secret = self.cache.pop(ticket_id)
+        if server_secret is None:
+            return self.full_handshake()
+        nonce = os.urandom(NONCE_SIZE)
+        session_key = _derive(server_secret, SESSION_INFO, salt=nonce)
+        assert session_key == _derive(client_secret, SESSION_INFO, salt=nonce)
+        new_ticket = self._issue(session_key)
+        end = current_milli_time()
+        self.resume_time = end - start
+        self.resumed = True
+        return session_key, new_ticket
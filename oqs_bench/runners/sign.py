@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Tuple
 
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import rsa, ec, padding
 
@@ -53,6 +54,8 @@ class OQSSignRunner(SignRunner):
         return signature
     
     def verify(self, public_key: bytes, plaintext: Plaintext, signature: Signature) -> bool:
+        # Keys from a PublicKeyDirectory are memoryviews, liboqs-python only takes bytes
+        public_key = bytes(public_key)
         with oqs.Signature(self.system) as verifier:
             start = current_milli_time()
             valid = verifier.verify(plaintext, signature, public_key)
@@ -97,7 +100,11 @@ class RSASignRunner(SignRunner):
     def verify(self, public_key: bytes, plaintext: Plaintext, signature: Signature) -> bool:
         start = current_milli_time()
         private_key_loaded = serialization.load_pem_public_key(public_key)
-        valid = private_key_loaded.verify(signature, plaintext, self.PADDING, self.HASH)
+        try:
+            private_key_loaded.verify(signature, plaintext, self.PADDING, self.HASH)
+            valid = True
+        except InvalidSignature:
+            valid = False
         end = current_milli_time()
         self.verify_time = end - start
         return valid
@@ -133,7 +140,11 @@ class ECCSignRunner(RSASignRunner):
     def verify(self, public_key: bytes, plaintext: Plaintext, signature: Signature) -> bool:
         start = current_milli_time()
         private_key_loaded = serialization.load_pem_public_key(public_key)
-        valid = private_key_loaded.verify(signature, plaintext, ec.ECDSA(self.HASH))
+        try:
+            private_key_loaded.verify(signature, plaintext, ec.ECDSA(self.HASH))
+            valid = True
+        except InvalidSignature:
+            valid = False
         end = current_milli_time()
         self.verify_time = end - start
         return valid
@@ -0,0 +1,170 @@
+import argparse
+import os
+from pathlib import Path
+from time import time
+from typing import Dict, List
+
+from oqs_bench.testing.plan import CURRENT_PATH, OPERATIONS, OPT_IN_SUITES, SUITES, Job, Suite, build_plan, estimate_plan, load_config
+from oqs_bench.testing.telemetry import DURATION_COLUMN, SUBSET_DURATION_COLUMN, JSONLinesSink, PrometheusTextfileSink, \
+    TerminalDashboardSink, Telemetry, format_duration, load_history
+
+RESULTS_PATH = CURRENT_PATH / "results"
+
+
+def _resolve(suite: Suite, budgets):
+    # Only imported once something is actually run
+    from functools import partial
+    from oqs_bench.testing import test_runner as test_runners
+
+    _, _, _, test_runner, _, constrained = suite
+    runner_class = getattr(test_runners, test_runner)
+    if constrained:
+        return partial(test_runners.ConstrainedTestRunner, test_runner=runner_class, budgets=budgets)
+    return runner_class
+
+
+def _merge(existing, results):
+    import pandas as pd
+
+    # Operations left out of this run keep their previous measurements
+    if results.index.is_unique and existing.index.is_unique:
+        columns = list(results.columns) + [column for column in existing.columns if column not in results.columns]
+        results = results.reindex(columns=columns).fillna(existing.reindex(index=results.index, columns=columns))
+    # Variants left out of this run keep their previous results
+    return pd.concat([existing[~existing.index.isin(results.index)], results])
+
+
+def _test(suite: Suite, jobs: List[Job], test_runner, isolation, telemetry: Telemetry):
+    import pandas as pd
+
+    result_dir, description = suite[:2]
+    telemetry.emit("suite_start", suite=result_dir, description=description)
+    algorithms = {}
+    for job in jobs:
+        algorithms.setdefault(job[1], []).append(job)
+    for algorithm, algorithm_jobs in algorithms.items():
+        variant_results = []
+        variant_traces = {}
+        for i, (_, _, variant, runner_name, operations) in enumerate(algorithm_jobs):
+            telemetry.variant_start(result_dir, algorithm, variant, i, len(algorithm_jobs))
+            start = time()
+            runner = test_runner(algorithm, variant, runner_name)
+            runner.operations = operations
+            results = runner.run(isolation, telemetry=telemetry)
+            duration = time() - start
+            # A subset rerun leaves the full run's duration in place when merged
+            duration_column = DURATION_COLUMN if operations is None else SUBSET_DURATION_COLUMN
+            variant_results.append(results.assign(**{duration_column: duration}))
+            for name, trace in runner.traces().items():
+                variant_traces.setdefault(name, []).append(trace.assign(Variant=variant))
+            telemetry.variant_end(result_dir, algorithm, variant, duration)
+        algorithm_data = pd.concat(variant_results)
+        csv_out = RESULTS_PATH / result_dir / f'{algorithm}.csv'
+        if not csv_out.parent.exists():
+            csv_out.parent.mkdir(parents=True)
+        if csv_out.exists():
+            existing = pd.read_csv(csv_out, index_col=0)
+            existing.index = existing.index.map(str)
+            algorithm_data = _merge(existing, algorithm_data)
+        algorithm_data.to_csv(csv_out)
+        for name, traces in variant_traces.items():
+            trace_out = csv_out.parent / name / csv_out.name
+            trace_out.parent.mkdir(parents=True, exist_ok=True)
+            trace_data = pd.concat(traces)
+            if trace_out.exists():
+                existing = pd.read_csv(trace_out)
+                existing = existing[~existing['Variant'].astype(str).isin(trace_data['Variant'])]
+                trace_data = pd.concat([existing, trace_data])
+            trace_data.to_csv(trace_out, index=False)
+    telemetry.emit("suite_end", suite=result_dir)
+
+
+def run(plan: Dict[Suite, List[Job]], isolation_mode: str = None, events: Path = None, prometheus: Path = None,
+        key_directory: Path = None):
+    import yaml
+    from oqs_bench.testing.device import write_device
+    from oqs_bench.testing.isolation import Isolation
+    from oqs_bench.testing.test_runner import KeyDirectoryTestRunner
+
+    if key_directory:
+        KeyDirectoryTestRunner.DIRECTORY_PATH = key_directory
+
+    isolation = Isolation(strict=isolation_mode == "strict") if isolation_mode else None
+    sinks = [TerminalDashboardSink()]
+    if events:
+        sinks.append(JSONLinesSink(events))
+    if prometheus:
+        sinks.append(PrometheusTextfileSink(prometheus))
+    telemetry = Telemetry(sinks, load_history(RESULTS_PATH))
+
+    budgets = None
+    if any(suite[5] for suite in plan):
+        budgets = yaml.safe_load(open(CURRENT_PATH / "configs" / "budgets.yml", "r"))
+
+    # Recorded so results can be normalized when aggregated across devices
+    write_device(RESULTS_PATH)
+
+    # Estimated like --dry-run, so operation subsets only count their share of the full-run history
+    planned = estimate_plan(plan, telemetry.history)
+    telemetry.start([job[:3] for job, _ in planned], [duration for _, duration in planned])
+    try:
+        for suite, jobs in plan.items():
+            _test(suite, jobs, _resolve(suite, budgets), isolation, telemetry)
+    finally:
+        telemetry.close()
+
+
+def print_suites():
+    for result_dir, description, config_name, test_runner, kind, constrained in SUITES:
+        variants = sum(len(candidate["variants"]) for candidate in load_config(config_name))
+        operations = ', '.join(OPERATIONS.get(test_runner, ())) or '-'
+        opt_in = "opt-in" if result_dir in OPT_IN_SUITES else ""
+        print(f"{result_dir:<18} {description:<48} {variants:>4} variants   {opt_in:<6}   operations: {operations}")
+
+
+def print_plan(plan: Dict[Suite, List[Job]]):
+    planned = estimate_plan(plan, load_history(RESULTS_PATH))
+    for (suite, algorithm, variant, runner, operations), duration in planned:
+        operations = ', '.join(sorted(operations)) if operations else 'all'
+        print(f"{suite:<18} {algorithm:<20} {variant:<32} {runner:<4} {operations:<20} {format_duration(duration)}")
+    known = [duration for _, duration in planned if duration is not None]
+    total = format_duration(sum(known)) if known else format_duration(None)
+    unknown = len(planned) - len(known)
+    print(f"{len(planned)} variants, estimated {total}" + (f" ({unknown} without history)" if unknown else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KEMs and DSSs.")
+    parser.add_argument("--suite", action='append', dest='suites', choices=[suite[0] for suite in SUITES], help="Only run these suites; opt-in suites only run when named")
+    parser.add_argument("--algorithm", help="Only run algorithms matching this regex")
+    parser.add_argument("--variant", help="Only run variants matching this regex")
+    parser.add_argument("--runner", action='append', dest='runners', help="Only run these runner types, e.g. OQS")
+    parser.add_argument("--level", action='append', dest='levels', help="Only run these claimed NIST levels (queries liboqs)")
+    parser.add_argument("--operation", action='append', dest='operations', choices=sorted({operation for operations in OPERATIONS.values() for operation in operations}),
+                        help="Only measure these operations; suites that cannot measure a subset are skipped")
+    parser.add_argument("--list", action='store_true', help="List the suites and exit")
+    parser.add_argument("--dry-run", action='store_true', help="Print the plan with estimated durations and exit")
+    # Environment variables are the defaults so existing setups keep working
+    parser.add_argument("--isolation", choices=["warn", "strict"], default=os.environ.get("OQS_BENCH_ISOLATION") or None,
+                        help="Pin cores, disable GC in timed loops and check the CPU governor")
+    parser.add_argument("--events", type=Path, default=os.environ.get("OQS_BENCH_EVENTS") or None, help="Append a JSON-lines event log")
+    parser.add_argument("--prometheus", type=Path, default=os.environ.get("OQS_BENCH_PROMETHEUS") or None, help="Write a node_exporter textfile")
+    parser.add_argument("--key-directory", type=Path, default=os.environ.get("OQS_BENCH_KEY_DIRECTORY") or None,
+                        help="Disk-backed directory for the key directory benchmarks' files, defaults to results/key_directories")
+    args = parser.parse_args()
+
+    if args.list:
+        print_suites()
+        return
+
+    plan = build_plan(args.suites, args.algorithm, args.variant, args.runners, args.levels, args.operations)
+    if not plan:
+        parser.exit(1, "Nothing matches the given filters.\n")
+    if args.dry_run:
+        print_plan(plan)
+        return
+    run(plan, args.isolation, args.events, args.prometheus, args.key_directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,3 +9,10 @@ class KEMConfig(TypedDict):
 
 class SignConfig(KEMConfig):
     ...
+
+
+class BudgetConfig(TypedDict, total=False):
+    name: str
+    memory: int
+    stack: int
+    cpu_quota: float
@@ -0,0 +1,79 @@
+import os
+import resource
+from pathlib import Path
+from typing import Dict
+
+import psutil
+
+from .config_types import BudgetConfig
+
+CGROUP_PATH = Path('/sys/fs/cgroup')
+CGROUP_NAME = 'oqs_bench'
+CPU_PERIOD_US = 100_000
+
+
+def _cgroup_path(budget: BudgetConfig, pid: int) -> Path:
+    return CGROUP_PATH / CGROUP_NAME / f"{budget['name']}-{pid}"
+
+
+def _enable_controllers(parent: Path) -> None:
+    # Child groups only get cpu.max and memory.max once the parent delegates the controllers
+    for controller in ('cpu', 'memory'):
+        try:
+            (parent / 'cgroup.subtree_control').write_text(f'+{controller}')
+        except OSError:
+            pass
+
+
+def _join_cgroup(budget: BudgetConfig, memory_limit: int = None) -> bool:
+    # Only the unified (v2) hierarchy is supported, and it has to be writable
+    if not (CGROUP_PATH / 'cgroup.controllers').exists():
+        return False
+    cgroup = _cgroup_path(budget, os.getpid())
+    try:
+        cgroup.mkdir(parents=True, exist_ok=True)
+        _enable_controllers(CGROUP_PATH)
+        _enable_controllers(cgroup.parent)
+        if budget.get('cpu_quota'):
+            (cgroup / 'cpu.max').write_text(f"{int(budget['cpu_quota'] * CPU_PERIOD_US)} {CPU_PERIOD_US}")
+        if memory_limit:
+            (cgroup / 'memory.max').write_text(str(memory_limit))
+        (cgroup / 'cgroup.procs').write_text(str(os.getpid()))
+    except OSError:
+        return False
+    return True
+
+
+def remove_cgroup(budget: BudgetConfig, pid: int) -> None:
+    # Called by the parent once the child has exited, an empty cgroup can then be removed
+    try:
+        _cgroup_path(budget, pid).rmdir()
+    except OSError:
+        pass
+
+
+def apply_budget(budget: BudgetConfig) -> Dict[str, bool]:
+    # Applied inside the forked child, so limits are relative to the interpreter it inherited
+    process = psutil.Process()
+    applied = {'Memory Limited': False, 'Stack Limited': False, 'CPU Pinned': False, 'CPU Quota Applied': False}
+
+    cores = sorted(os.sched_getaffinity(0))
+    os.sched_setaffinity(0, cores[-1:])
+    applied['CPU Pinned'] = True
+
+    memory_limit = None
+    if budget.get('memory'):
+        address_space = process.memory_info().vms + budget['memory']
+        resource.setrlimit(resource.RLIMIT_AS, (address_space, address_space))
+        memory_limit = process.memory_info().rss + budget['memory']
+        applied['Memory Limited'] = True
+
+    if budget.get('stack'):
+        _, hard = resource.getrlimit(resource.RLIMIT_STACK)
+        stack = budget['stack'] if hard == resource.RLIM_INFINITY else min(budget['stack'], hard)
+        resource.setrlimit(resource.RLIMIT_STACK, (stack, stack))
+        applied['Stack Limited'] = True
+
+    if budget.get('cpu_quota') or memory_limit:
+        applied['CPU Quota Applied'] = _join_cgroup(budget, memory_limit) and bool(budget.get('cpu_quota'))
+    return applied
@@ -0,0 +1,28 @@
+import os
+import platform
+from pathlib import Path
+
+import psutil
+import yaml
+
+
+def describe_device() -> dict:
+    frequency = psutil.cpu_freq()
+    return {
+        'name': platform.node(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'system': f'{platform.system()} {platform.release()}',
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        # Timings are normalized to cycles with the maximum (non-throttled) frequency, not the one measured
+        'cpu_frequency_mhz': (frequency.max or frequency.current) if frequency else None,
+        'cpu_frequency_source': ('maximum' if frequency.max else 'current') if frequency else None,
+        'memory_bytes': psutil.virtual_memory().total,
+    }
+
+
+def write_device(results_path: Path) -> None:
+    results_path.mkdir(parents=True, exist_ok=True)
+    with open(results_path / 'device.yml', 'w') as device_file:
+        yaml.safe_dump(describe_device(), device_file)
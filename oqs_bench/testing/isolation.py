@@ -0,0 +1,134 @@
+import gc
+import os
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+CPU_PATH = Path('/sys/devices/system/cpu')
+
+
+class NoisyEnvironmentError(RuntimeError):
+    ...
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def read_governors(cores: List[int]) -> Dict[int, Optional[str]]:
+    return {core: _read(CPU_PATH / f'cpu{core}' / 'cpufreq' / 'scaling_governor') for core in cores}
+
+
+def turbo_enabled() -> Optional[bool]:
+    # intel_pstate exposes the inverse flag, acpi-cpufreq and amd-pstate expose boost
+    no_turbo = _read(CPU_PATH / 'intel_pstate' / 'no_turbo')
+    if no_turbo is not None:
+        return no_turbo == '0'
+    boost = _read(CPU_PATH / 'cpufreq' / 'boost')
+    if boost is not None:
+        return boost == '1'
+    return None
+
+
+class Isolation:
+    PRIORITY = -10
+    LOAD_THRESHOLD = 0.5
+    CV_THRESHOLD = 0.05
+
+    def __init__(self, cores: List[int] = None, monitor_cores: List[int] = None, priority: int = PRIORITY, strict: bool = False) -> None:
+        available = sorted(os.sched_getaffinity(0))
+        # By default the benchmark gets the last core and the monitors the one before it
+        self.cores = cores or available[-1:]
+        self.monitor_cores = monitor_cores or available[-2:-1] or self.cores
+        self.priority = priority
+        self.strict = strict
+        self.issues = []
+        # Not permitted for unprivileged users, which is reported but not counted as noise
+        self.priority_raised = None
+        self.gc_deferred = 0
+
+    def check(self) -> List[str]:
+        issues = []
+        for core, governor in read_governors(self.cores).items():
+            if governor is not None and governor != 'performance':
+                issues.append(f'cpu{core} governor is {governor}')
+        if turbo_enabled():
+            issues.append('turbo boost is enabled')
+        load = os.getloadavg()[0]
+        if load > len(os.sched_getaffinity(0)) * self.LOAD_THRESHOLD:
+            issues.append(f'system load is {load:.2f}')
+        return issues
+
+    def __enter__(self) -> 'Isolation':
+        self._original_affinity = os.sched_getaffinity(0)
+        self._original_priority = os.getpriority(os.PRIO_PROCESS, 0)
+        self.gc_deferred = 0
+        self.issues = self.check()
+
+        os.sched_setaffinity(0, self.cores)
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, self.priority)
+            self.priority_raised = True
+        except PermissionError:
+            self.priority_raised = False
+
+        if self.issues:
+            message = 'Noisy benchmark environment: ' + '; '.join(self.issues)
+            if self.strict:
+                self.__exit__(None, None, None)
+                raise NoisyEnvironmentError(message)
+            warnings.warn(message)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        os.sched_setaffinity(0, self._original_affinity)
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, self._original_priority)
+        except PermissionError:
+            pass
+
+    def collect(self) -> None:
+        # Called once per phase, so the collector has little pending inside the timed loops
+        gc.collect()
+
+    @contextmanager
+    def timed_region(self):
+        enabled = gc.isenabled()
+        gc.disable()
+        before = gc.get_count()[0]
+        try:
+            yield
+        finally:
+            # The youngest generation is collected each time its count passes the threshold,
+            # so its growth across the region says how many collections were held off
+            threshold = gc.get_threshold()[0]
+            if threshold:
+                self.gc_deferred += max(gc.get_count()[0] - before, 0) // threshold
+            if enabled:
+                gc.enable()
+
+    def report(self, results: pd.DataFrame) -> Dict[str, object]:
+        # Coefficient of variation of every timed operation in the results
+        cvs = [
+            results[column.replace('Mean ', '', 1) + ' Standard Deviation'] / results[column]
+            for column in results.columns
+            if column.startswith('Mean ') and column.endswith(' Time')
+            and column.replace('Mean ', '', 1) + ' Standard Deviation' in results.columns
+        ]
+        worst_cv = max(cv.max() for cv in cvs) if cvs else float('nan')
+        return {
+            'Pinned Cores': ' '.join(map(str, self.cores)),
+            'CPU Governor': ' '.join(sorted({str(governor) for governor in read_governors(self.cores).values()})),
+            'Turbo Enabled': turbo_enabled(),
+            'Priority Raised': self.priority_raised,
+            'GC Collections Deferred In Timed Regions': self.gc_deferred,
+            'Environment Issues': '; '.join(self.issues),
+            'Worst Time Coefficient of Variation': worst_cv,
+            'Stable Run': not self.issues and worst_cv < self.CV_THRESHOLD,
+        }
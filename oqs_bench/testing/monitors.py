@@ -1,8 +1,11 @@
 import os
 import threading
-from time import sleep
+from time import sleep, time
 from collections import deque
+from pathlib import Path
+from typing import List, Optional, Tuple
 
+import pandas as pd
 import psutil
 import resource
 
@@ -10,12 +13,18 @@ def get_process():
     return psutil.Process(os.getpid())
 
 class UsageMonitoringThread(threading.Thread):
-    def __init__(self, name: str, process: psutil.Process = None) -> None:
+    def __init__(self, name: str, process: psutil.Process = None, cores: List[int] = None) -> None:
         self._stop_event = threading.Event()
         self._sleep_period = .0005
         self.result = None
         self.process = process
+        self.cores = cores
         super().__init__(name=name)
+
+    def _pin(self):
+        # Keep the monitor off the cores the benchmark runs on
+        if self.cores:
+            os.sched_setaffinity(0, self.cores)
     
     def run(self):
         while not self._stop_event.is_set():
@@ -28,10 +37,11 @@ class UsageMonitoringThread(threading.Thread):
     
 
 class CPUUsageMonitor(UsageMonitoringThread):
-    def __init__(self, name: str = 'CPU Usage Monitor', process: psutil.Process = None) -> None:
-        super().__init__(name, process)
+    def __init__(self, name: str = 'CPU Usage Monitor', process: psutil.Process = None, cores: List[int] = None) -> None:
+        super().__init__(name, process, cores)
 
     def run(self):
+        self._pin()
         if self.process is None:
             self.process = get_process()
         start = self.process.cpu_percent()
@@ -43,10 +53,11 @@ class CPUUsageMonitor(UsageMonitoringThread):
 
 
 class MemoryUsageMonitor(UsageMonitoringThread):
-    def __init__(self, name: str = 'RAM Usage Monitor', process: psutil.Process = None) -> None:
-        super().__init__(name, process)
+    def __init__(self, name: str = 'RAM Usage Monitor', process: psutil.Process = None, cores: List[int] = None) -> None:
+        super().__init__(name, process, cores)
 
     def run(self):
+        self._pin()
         if self.process is None:
             self.process = get_process()
         start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
@@ -55,3 +66,102 @@ class MemoryUsageMonitor(UsageMonitoringThread):
             sleep(self._sleep_period)
             measurements.append(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
         self.result = max(measurements) - start if len(measurements) != 0 else 0
+
+
+THERMAL_PATH = Path('/sys/class/thermal')
+CPU_PATH = Path('/sys/devices/system/cpu')
+# Raspberry Pi firmware flags, bit 2 is "currently throttled"
+PI_THROTTLED_PATH = Path('/sys/devices/platform/soc/soc:firmware/get_throttled')
+
+
+def _read_number(path: Path) -> Optional[float]:
+    try:
+        return float(path.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def read_temperature() -> Optional[float]:
+    temperatures = [_read_number(zone / 'temp') for zone in THERMAL_PATH.glob('thermal_zone*')]
+    temperatures = [temperature / 1000 for temperature in temperatures if temperature is not None]
+    return max(temperatures) if temperatures else None
+
+
+def read_frequency(core: int = None) -> Tuple[Optional[float], Optional[float]]:
+    # Current and maximum frequency in MHz, per core when the kernel exposes it
+    if core is not None:
+        current = _read_number(CPU_PATH / f'cpu{core}' / 'cpufreq' / 'scaling_cur_freq')
+        maximum = _read_number(CPU_PATH / f'cpu{core}' / 'cpufreq' / 'cpuinfo_max_freq')
+        if current is not None:
+            return current / 1000, maximum / 1000 if maximum else None
+    frequency = psutil.cpu_freq()
+    if frequency is None:
+        return None, None
+    return frequency.current, frequency.max or None
+
+
+def read_pi_throttled() -> Optional[bool]:
+    try:
+        return bool(int(PI_THROTTLED_PATH.read_text().strip(), 16) & 0x4)
+    except (OSError, ValueError):
+        return None
+
+
+class DriftMonitor(UsageMonitoringThread):
+    THROTTLE_RATIO = 0.9
+    THROTTLE_TEMPERATURE = 80.0
+
+    def __init__(self, name: str = 'Drift Monitor', process: psutil.Process = None, cores: List[int] = None, period: float = .1) -> None:
+        super().__init__(name, process, cores)
+        self._sleep_period = period
+        self.phase = None
+        self.samples = []
+        # Latest state, read by the benchmark thread to tag its timing samples
+        self.throttled = False
+
+    def _sample(self) -> dict:
+        core = self.process.cpu_num() if hasattr(self.process, 'cpu_num') else None
+        frequency, max_frequency = read_frequency(core)
+        temperature = read_temperature()
+        pi_throttled = read_pi_throttled()
+        throttled = bool(
+            pi_throttled
+            or (frequency and max_frequency and frequency < max_frequency * self.THROTTLE_RATIO)
+            or (temperature is not None and temperature >= self.THROTTLE_TEMPERATURE)
+        )
+        return {
+            'Timestamp': time(),
+            'Phase': self.phase,
+            'Core': core,
+            'Frequency (MHz)': frequency,
+            'Maximum Frequency (MHz)': max_frequency,
+            'Temperature (C)': temperature,
+            'Load': os.getloadavg()[0],
+            'CPU Usage': self.process.cpu_percent(),
+            'Throttled': throttled,
+        }
+
+    def run(self):
+        self._pin()
+        if self.process is None:
+            self.process = get_process()
+        self.process.cpu_percent()
+        while not self._stop_event.is_set():
+            sample = self._sample()
+            self.throttled = sample['Throttled']
+            self.samples.append(sample)
+            self._stop_event.wait(self._sleep_period)
+        self.result = pd.DataFrame(self.samples)
+
+    def summary(self) -> dict:
+        samples = self.result
+        if samples is None or samples.empty:
+            return {}
+        frequency = samples['Frequency (MHz)'].dropna()
+        # Per-phase figures stay in the drift trace, which has a Phase column
+        return {
+            'Frequency Drift (MHz)': frequency.max() - frequency.min() if not frequency.empty else None,
+            'Minimum Frequency (MHz)': frequency.min() if not frequency.empty else None,
+            'Maximum Temperature (C)': samples['Temperature (C)'].max(),
+            'Throttled Fraction': samples['Throttled'].mean(),
+        }
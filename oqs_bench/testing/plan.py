@@ -0,0 +1,125 @@
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import yaml
+
+from .config_types import KEMConfig
+from .telemetry import estimate
+
+CURRENT_PATH = Path(__file__).parent
+
+# (result dir, description, config, test runner, kind, constrained)
+Suite = Tuple[str, str, str, str, str, bool]
+
+# Test runners are named rather than imported, so listing and planning never load pandas, numpy or liboqs
+SUITES: List[Suite] = [
+    ("kem", "Testing KEMs.", "kems", "KEMTestRunner", "kem", False),
+    ("sign", "Testing DSSs.", "signschemes", "SignTestRunner", "sign", False),
+    ("batch_sign", "Testing batched DSSs.", "batch_signschemes", "BatchSignTestRunner", "sign", False),
+    ("hybrid", "Testing KEM+AEAD hybrid encryption.", "kems", "HybridTestRunner", "kem", False),
+    ("kem_adversarial", "Testing KEMs under invalid ciphertexts.", "kems", "AdversarialKEMTestRunner", "kem", False),
+    ("sign_adversarial", "Testing DSSs under forged signatures.", "signschemes", "AdversarialSignTestRunner", "sign", False),
+    ("chain", "Testing certificate chains.", "chains", "ChainTestRunner", "sign", False),
+    ("kem_resumption", "Testing KEM session resumption.", "resumption_kems", "ResumptionTestRunner", "kem", False),
+    ("kem_key_directory", "Testing KEMs with memory-mapped key directories.", "key_directory_kems", "KEMKeyDirectoryTestRunner", "kem", False),
+    ("sign_key_directory", "Testing DSSs with memory-mapped key directories.", "key_directory_signschemes", "SignKeyDirectoryTestRunner", "sign", False),
+    ("kem_constrained", "Testing KEMs under resource budgets.", "kems", "KEMTestRunner", "kem", True),
+    ("sign_constrained", "Testing DSSs under resource budgets.", "signschemes", "SignTestRunner", "sign", True),
+    ("kem_soak", "Soak testing KEMs.", "soak_kems", "KEMSoakTestRunner", "kem", False),
+    ("sign_soak", "Soak testing DSSs.", "soak_signschemes", "SignSoakTestRunner", "sign", False),
+]
+
+# Long or disk-hungry suites, only run when named with --suite:
+# a soak runs each operation for an hour, a constrained suite repeats the sweep per budget,
+# and key directories write files of up to 16 GiB
+OPT_IN_SUITES = {"kem_soak", "sign_soak", "kem_constrained", "sign_constrained", "kem_key_directory", "sign_key_directory"}
+
+# Test runners that can measure a subset of their operations
+OPERATIONS = {
+    "KEMTestRunner": ("keygen", "encaps", "decaps"),
+    "SignTestRunner": ("keygen", "sign", "verify"),
+    "KEMSoakTestRunner": ("keygen", "encaps", "decaps"),
+    "SignSoakTestRunner": ("keygen", "sign", "verify"),
+}
+
+# Runners for schemes that predate NIST's post-quantum levels
+CLASSICAL_RUNNERS = {"RSA", "ECC"}
+
+# (suite, algorithm, variant, runner, operations)
+Job = Tuple[str, str, str, str, Optional[Set[str]]]
+
+
+def load_config(config_name: str) -> List[KEMConfig]:
+    return yaml.safe_load(open(CURRENT_PATH / "configs" / f"{config_name}.yml", "r"))
+
+
+def get_nist_level(kind: str, variant: str, runner: str) -> str:
+    if runner in CLASSICAL_RUNNERS:
+        return "Classical"
+    try:
+        import oqs
+        mechanism = oqs.KeyEncapsulation if kind == 'kem' else oqs.Signature
+        with mechanism(variant) as client:
+            return str(client.details["claimed_nist_level"])
+    except Exception:
+        # liboqs is missing, or does not know the variant (e.g. results from an older liboqs)
+        return "Unknown"
+
+
+def algorithm_runners(kind: str) -> Dict[str, str]:
+    # Stored results only carry the algorithm, the configs say which runner produced it
+    runners = {}
+    for _, _, config_name, _, suite_kind, _ in SUITES:
+        if suite_kind == kind:
+            for candidate in load_config(config_name):
+                runners[candidate["algorithm"]] = candidate["runner"]
+    return runners
+
+
+def build_plan(suites: List[str] = None, algorithm: str = None, variant: str = None, runners: List[str] = None,
+               levels: List[str] = None, operations: List[str] = None) -> Dict[Suite, List[Job]]:
+    # Regexes are searched, so "Kyber" matches "CRYSTALS-Kyber"; an operation subset skips suites that cannot honour it
+    plan = {}
+    for suite in SUITES:
+        result_dir, _, config_name, test_runner, kind, _ = suite
+        if suites and result_dir not in suites:
+            continue
+        if not suites and result_dir in OPT_IN_SUITES:
+            continue
+        selected = None
+        if operations:
+            if test_runner not in OPERATIONS:
+                continue
+            selected = set(operations) & set(OPERATIONS[test_runner])
+            if not selected:
+                continue
+        jobs = []
+        for candidate in load_config(config_name):
+            if algorithm and not re.search(algorithm, candidate["algorithm"]):
+                continue
+            if runners and candidate["runner"] not in runners:
+                continue
+            for _variant in candidate["variants"]:
+                if variant and not re.search(variant, _variant):
+                    continue
+                if levels and get_nist_level(kind, _variant, candidate["runner"]) not in levels:
+                    continue
+                jobs.append((result_dir, candidate["algorithm"], _variant, candidate["runner"], selected))
+        if jobs:
+            plan[suite] = jobs
+    return plan
+
+
+def estimate_plan(plan: Dict[Suite, List[Job]], history: Dict[Tuple[str, str], float]) -> List[Tuple[Job, Optional[float]]]:
+    jobs = [job for jobs in plan.values() for job in jobs]
+    estimates = estimate([(suite, algorithm, variant) for suite, algorithm, variant, _, _ in jobs], history)
+    planned = []
+    runner_operations = {result_dir: OPERATIONS.get(test_runner) for result_dir, _, _, test_runner, _, _ in plan}
+    for job, duration in zip(jobs, estimates):
+        selected = job[4]
+        # History is recorded for full runs, so a subset is assumed to take its share of the operations
+        if duration is not None and selected is not None:
+            duration *= len(selected) / len(runner_operations[job[0]])
+        planned.append((job, duration))
+    return planned
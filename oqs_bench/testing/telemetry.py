@@ -0,0 +1,220 @@
+import csv
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from time import time
+from typing import Dict, List, TextIO, Tuple
+
+DURATION_COLUMN = 'Test Duration'
+# Runs of an operation subset are kept apart so they do not skew estimates of full runs
+SUBSET_DURATION_COLUMN = 'Subset Test Duration'
+
+# (suite, algorithm, variant)
+PlanEntry = Tuple[str, str, str]
+
+
+def load_history(results_path: Path) -> Dict[Tuple[str, str], float]:
+    # Wall-clock duration of every previously stored variant, keyed by (suite, variant)
+    # Read with csv rather than pandas so that planning a run stays instant
+    history = {}
+    for _file in results_path.glob('*/*.csv'):
+        with open(_file, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header or DURATION_COLUMN not in header:
+                continue
+            column = header.index(DURATION_COLUMN)
+            for row in reader:
+                try:
+                    duration = float(row[column])
+                except (IndexError, ValueError):
+                    continue
+                key = (_file.parent.name, row[0])
+                history[key] = max(history.get(key, duration), duration)
+    return history
+
+
+def estimate(plan: List[PlanEntry], history: Dict[Tuple[str, str], float]) -> List[float]:
+    # Unknown variants are estimated from the suite's average, then the overall average
+    suite_durations = {}
+    for (suite, _), duration in history.items():
+        suite_durations.setdefault(suite, []).append(duration)
+    overall = [duration for durations in suite_durations.values() for duration in durations]
+    fallback = sum(overall) / len(overall) if overall else None
+    estimates = []
+    for suite, _, variant in plan:
+        if (suite, variant) in history:
+            estimates.append(history[(suite, variant)])
+        elif suite in suite_durations:
+            estimates.append(sum(suite_durations[suite]) / len(suite_durations[suite]))
+        else:
+            estimates.append(fallback)
+    return estimates
+
+
+def format_duration(seconds: float) -> str:
+    if seconds is None:
+        return '--:--:--'
+    seconds = int(seconds)
+    return f'{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}'
+
+
+class Sink(ABC):
+    @abstractmethod
+    def emit(self, event: dict) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class JSONLinesSink(Sink):
+    def __init__(self, path: Path) -> None:
+        self.file = open(path, 'a')
+
+    def emit(self, event: dict) -> None:
+        self.file.write(json.dumps(event, default=str) + '\n')
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class PrometheusTextfileSink(Sink):
+    # For node_exporter's textfile collector; the file is replaced atomically on every update
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.labels = {}
+        # Sweep progress is unlabelled, measurements carry the current variant and phase
+        self.metrics = {
+            'oqs_bench_variants_total': 0,
+            'oqs_bench_variants_completed': 0,
+        }
+        self.variant_metrics = {}
+
+    def emit(self, event: dict) -> None:
+        kind = event['event']
+        if kind == 'sweep_start':
+            self.metrics['oqs_bench_variants_total'] = len(event['plan'])
+        elif kind == 'variant_start':
+            self.labels = {'suite': event['suite'], 'algorithm': event['algorithm'], 'variant': event['variant']}
+            self.variant_metrics = {}
+        elif kind == 'variant_end':
+            self.metrics['oqs_bench_variants_completed'] += 1
+            self.metrics['oqs_bench_last_variant_duration_seconds'] = event['duration']
+        elif kind == 'phase_start':
+            self.labels['phase'] = event['phase']
+            self.variant_metrics = {}
+        elif kind == 'samples':
+            self.variant_metrics['oqs_bench_phase_samples'] = event['count']
+        elif kind == 'throughput':
+            self.variant_metrics['oqs_bench_ops_per_second'] = event['ops_per_second']
+        if event.get('eta') is not None:
+            self.metrics['oqs_bench_eta_seconds'] = event['eta']
+        self.metrics['oqs_bench_last_event_timestamp_seconds'] = event['time']
+        self._write()
+
+    def _write(self) -> None:
+        labels = ','.join(f'{name}="{value}"' for name, value in self.labels.items())
+        lines = []
+        for name, value in self.metrics.items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        for name, value in self.variant_metrics.items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name}{{{labels}}} {value}')
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.path)
+
+
+class TerminalDashboardSink(Sink):
+    def __init__(self, stream: TextIO = sys.stdout) -> None:
+        self.stream = stream
+        self.state = {}
+
+    def emit(self, event: dict) -> None:
+        kind = event['event']
+        if kind == 'suite_start':
+            self.stream.write(f"{event['description']}\n")
+        elif kind == 'suite_end':
+            self.stream.write('\n')
+        elif kind == 'variant_start':
+            self.state = dict(event)
+        elif kind in ('phase_start', 'samples', 'throughput'):
+            if kind == 'phase_start':
+                for key in ('ops_per_second', 'count', 'total'):
+                    self.state.pop(key, None)
+            self.state.update({key: value for key, value in event.items() if key not in ('event', 'time')})
+        else:
+            return
+        self._render(event['time'])
+
+    def _render(self, now: float) -> None:
+        state = self.state
+        if 'variant' not in state:
+            return
+        parts = [
+            f"Testing {state['algorithm']}, Variant {state['index'] + 1}/{state['variants']} ({state['variant']})",
+            state.get('phase') or '',
+        ]
+        if state.get('count') is not None:
+            parts.append(f"{state['count']}/{state['total']} samples")
+        if state.get('ops_per_second') is not None:
+            parts.append(f"{state['ops_per_second']:.1f} ops/s")
+        parts.append(f"elapsed {format_duration(now - state['time'])}")
+        parts.append(f"ETA {format_duration(state.get('eta'))}")
+        self.stream.write('\r' + ' | '.join(part for part in parts if part) + '\033[K')
+        self.stream.flush()
+
+
+class Telemetry:
+    def __init__(self, sinks: List[Sink], history: Dict[Tuple[str, str], float] = None) -> None:
+        self.sinks = sinks
+        self.history = history or {}
+        self.remaining = []
+        self.completed = []
+        self._variant_started = None
+
+    def emit(self, event: str, **fields) -> None:
+        payload = {'event': event, 'time': time(), **fields}
+        if self.remaining:
+            payload.setdefault('eta', self.eta(payload['time']))
+        for sink in self.sinks:
+            sink.emit(payload)
+
+    def start(self, plan: List[PlanEntry], estimates: List[float] = None) -> None:
+        # Remaining (entry, estimated seconds) pairs, consumed as variants finish
+        if estimates is None:
+            estimates = estimate(plan, self.history)
+        self.remaining = list(zip(plan, estimates))
+        self.emit('sweep_start', plan=plan)
+
+    def eta(self, now: float) -> float:
+        # Without any history, variants are assumed to take as long as the ones finished so far
+        average = sum(self.completed) / len(self.completed) if self.completed else None
+        estimates = [average if duration is None else duration for _, duration in self.remaining]
+        if any(duration is None for duration in estimates):
+            return None
+        eta = sum(estimates)
+        if self._variant_started is not None and estimates:
+            eta -= min(now - self._variant_started, estimates[0])
+        return eta
+
+    def variant_start(self, suite: str, algorithm: str, variant: str, index: int, variants: int) -> None:
+        self._variant_started = time()
+        self.emit('variant_start', suite=suite, algorithm=algorithm, variant=variant, index=index, variants=variants)
+
+    def variant_end(self, suite: str, algorithm: str, variant: str, duration: float) -> None:
+        entry = (suite, algorithm, variant)
+        self.remaining = [(planned, estimate) for planned, estimate in self.remaining if planned != entry]
+        self.completed.append(duration)
+        self._variant_started = None
+        self.emit('variant_end', suite=suite, algorithm=algorithm, variant=variant, duration=duration)
+
+    def close(self) -> None:
+        self.emit('sweep_end')
+        for sink in self.sinks:
+            sink.close()
@@ -1,15 +1,38 @@
+import io
+import os
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import warnings
+from multiprocessing.connection import wait
 from abc import ABC, abstractmethod
-from typing import Tuple
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
 from time import time
+from contextlib import nullcontext
 
 import pandas as pd
 import numpy as np
+from cryptography.exceptions import InvalidSignature
+import psutil
 from numpy import random
 
 from oqs_bench.runners.kem import ECCKEMRunner, OQSKEMRunner, RSAKEMRunner
 from oqs_bench.runners.sign import OQSSignRunner, RSASignRunner
+from oqs_bench.runners.utils import current_milli_time
+from oqs_bench.runners.hybrid import HybridEncryptionRunner, AEADS
+from oqs_bench.runners.chain import CertificateChainBuilder, ChainVerifier, chain_length
+from oqs_bench.runners.batch import BatchSignRunner, INDEX_SIZE, proof_length
+from oqs_bench.runners.directory import PublicKeyDirectory, directory_size
+from oqs_bench.runners.resumption import KEY_SIZE, TICKET_ID_SIZE, ResumptionRunner, TicketCache
 
-from .monitors import MemoryUsageMonitor, get_process
+from .config_types import BudgetConfig
+from .constraints import apply_budget, remove_cgroup
+from .isolation import Isolation
+from .monitors import DriftMonitor, MemoryUsageMonitor, get_process
+from .telemetry import Telemetry
 
 KEM_RUNNERS = {
     'OQS': OQSKEMRunner,
@@ -25,35 +48,132 @@ SIG_RUNNERS = {
 class TestRunner(ABC):
     PS_THRESH = 10
     X = 500
+    SAMPLE_BATCH = 50
+    THROUGHPUT_WINDOW = 1
 
     def __init__(self, algorithm: str, variant: str):
         self.algorithm = algorithm
         self.variant = variant
         self.process = get_process()
+        self.isolation: Isolation = None
+        self.drift_monitor: DriftMonitor = None
+        self.drift: pd.DataFrame = None
+        self.telemetry: Telemetry = None
+        # None measures everything, otherwise a subset of e.g. {'keygen', 'encaps', 'decaps'}
+        self.operations: Set[str] = None
+        self._current_phase = None
+        self._phase_started = None
+        self._samples = 0
+        # Whether the drift monitor saw throttling around each monitored call since the last phase
+        self._throttled_flags = []
+        self.throttled_samples = 0
+        self.discarded_samples = 0
+
+    def _measures(self, operation: str) -> bool:
+        return self.operations is None or operation in self.operations
+
+    def _phase(self, phase: str) -> None:
+        if self.drift_monitor is not None:
+            self.drift_monitor.phase = phase
+        if self.telemetry is not None:
+            self._end_phase()
+            self.telemetry.emit('phase_start', phase=phase)
+        self._current_phase = phase
+        self._phase_started = time()
+        self._samples = 0
+        self._throttled_flags = []
+        if self.isolation is not None:
+            self.isolation.collect()
+
+    def _end_phase(self) -> None:
+        if self.telemetry is not None and self._current_phase is not None:
+            self.telemetry.emit('phase_end', phase=self._current_phase, duration=time() - self._phase_started, samples=self._samples)
+
+    def _timed_region(self):
+        return self.isolation.timed_region() if self.isolation is not None else nullcontext()
     
     def _monitor_crypto_func(self, func, *args) -> Tuple[object, float]:
         # Init monitors
-        memory_monitor = MemoryUsageMonitor(process=self.process)
+        memory_monitor = MemoryUsageMonitor(process=self.process, cores=self.isolation and self.isolation.monitor_cores)
         memory_monitor.start()
 
         # Output
-        result = func(*args)
+        with self._timed_region():
+            result = func(*args)
 
         # Measurements
         memory_usage = memory_monitor.get_measurement()
+        throttled = self.drift_monitor is not None and self.drift_monitor.throttled
+        self._throttled_flags.append(throttled)
+        self.throttled_samples += throttled
+
+        self._samples += 1
+        if self.telemetry is not None and self._samples % self.SAMPLE_BATCH == 0:
+            self.telemetry.emit('samples', phase=self._current_phase, count=self._samples, total=self.X)
 
         return result, memory_usage
 
+    def _discard_throttled(self, *samples: np.ndarray) -> Tuple[np.ndarray, ...]:
+        # Drops the samples of the last monitored loop taken while throttled, unless that was all of them
+        flags = np.array(self._throttled_flags[-len(samples[0]):], dtype=bool)
+        self._throttled_flags = []
+        if len(flags) != len(samples[0]) or not flags.any() or flags.all():
+            return samples
+        self.discarded_samples += int(flags.sum())
+        return tuple(sample[~flags] for sample in samples)
+
     def _bench_per_second(self, func, *args) -> float:
-        original_time_s = time()
-        current_time_s = original_time_s
-        count = 0
-        while current_time_s < original_time_s + self.PS_THRESH:
-            _ = func(*args)
-            count += 1
-            current_time_s = time()
+        # The throughput window runs after the hot loop, so it is tracked as its own phase
+        if self._current_phase is not None:
+            self._phase(f'{self._current_phase} Throughput')
+        with self._timed_region():
+            original_time_s = time()
+            current_time_s = original_time_s
+            window_time_s = original_time_s
+            count = 0
+            while current_time_s < original_time_s + self.PS_THRESH:
+                _ = func(*args)
+                count += 1
+                current_time_s = time()
+                if self.telemetry is not None and current_time_s - window_time_s >= self.THROUGHPUT_WINDOW:
+                    self.telemetry.emit('throughput', phase=self._current_phase, ops_per_second=count / (current_time_s - original_time_s))
+                    window_time_s = current_time_s
         return count / float(self.PS_THRESH)
 
+    def run(self, isolation: Isolation = None, track_drift: bool = True, telemetry: Telemetry = None) -> pd.DataFrame:
+        self.isolation = isolation
+        self.telemetry = telemetry
+        self.drift_monitor = DriftMonitor(process=self.process, cores=isolation and isolation.monitor_cores) if track_drift else None
+        try:
+            with isolation if isolation is not None else nullcontext():
+                if self.drift_monitor is not None:
+                    self.drift_monitor.start()
+                if isolation is not None:
+                    # Runners without phases still start from a collected heap
+                    isolation.collect()
+                try:
+                    results = self.test()
+                finally:
+                    if self.drift_monitor is not None:
+                        self.drift = self.drift_monitor.get_measurement()
+                    self._end_phase()
+        finally:
+            self.isolation = None
+            self.telemetry = None
+
+        if isolation is not None:
+            results = results.assign(**isolation.report(results))
+        if self.drift_monitor is not None:
+            results = results.assign(**self.drift_monitor.summary(), **{
+                'Throttled Samples': self.throttled_samples,
+                'Discarded Throttled Samples': self.discarded_samples,
+            })
+        return results
+
+    def traces(self) -> Dict[str, pd.DataFrame]:
+        # Time series recorded alongside the results, saved next to them by name
+        return {'drift': self.drift} if self.drift is not None else {}
+
     @abstractmethod
     def test(self) -> pd.DataFrame:
         ...
@@ -64,62 +184,70 @@ class KEMTestRunner(TestRunner):
         self.runner = KEM_RUNNERS[runner](algorithm, variant)
     
     def test(self) -> pd.DataFrame:
+        # Operations left out are still run once, untimed, for their outputs
+        results = {}
+
         # Keygen
-        keygen_times = np.zeros(self.X)
-        keygen_memory_usages = np.zeros(self.X)
-        for i in range(self.X):
-            keypair, keygen_memory_usage = self._monitor_crypto_func(self.runner.generate_key)
-            keygen_times[i] = self.runner.keygen_time
-            keygen_memory_usages[i] = keygen_memory_usage
-        keygen_time_mean = keygen_times.mean()
-        keygen_time_std_div = keygen_times.std()
-        keygen_memory_usage_max = keygen_memory_usages.max()
-        pubkey_length = len(keypair[0])
-        secretkey_length = len(keypair[1])
+        if self._measures('keygen'):
+            self._phase('Keygen')
+            keygen_times = np.zeros(self.X)
+            keygen_memory_usages = np.zeros(self.X)
+            for i in range(self.X):
+                keypair, keygen_memory_usage = self._monitor_crypto_func(self.runner.generate_key)
+                keygen_times[i] = self.runner.keygen_time
+                keygen_memory_usages[i] = keygen_memory_usage
+            keygen_times, keygen_memory_usages = self._discard_throttled(keygen_times, keygen_memory_usages)
+            results.update({
+                'Mean Keygen Time': keygen_times.mean(),
+                'Keygen Time Standard Deviation': keygen_times.std(),
+                'Maximum Keygen Memory Usage': keygen_memory_usages.max(),
+            })
+        else:
+            keypair = self.runner.generate_key()
 
         # Encapsulate
-        encaps_times = np.zeros(self.X)
-        encaps_memory_usages = np.zeros(self.X)
-        for i in range(self.X):
-            (ciphertext, shared_secret), encaps_memory_usage = self._monitor_crypto_func(self.runner.encapsulate, keypair[0])
-            encaps_times[i] =  self.runner.encrypt_time
-            encaps_memory_usages[i] = encaps_memory_usage
-        encaps_time_mean = encaps_times.mean()
-        encaps_time_std_div = encaps_times.std()
-        encaps_memory_usage_max = encaps_memory_usages.max()
-        ciphertext_length = len(ciphertext)
-        decapsulations_per_second = self._bench_per_second(self.runner.encapsulate, keypair[0])
+        if self._measures('encaps'):
+            self._phase('Encapsulation')
+            encaps_times = np.zeros(self.X)
+            encaps_memory_usages = np.zeros(self.X)
+            for i in range(self.X):
+                (ciphertext, shared_secret), encaps_memory_usage = self._monitor_crypto_func(self.runner.encapsulate, keypair[0])
+                encaps_times[i] =  self.runner.encrypt_time
+                encaps_memory_usages[i] = encaps_memory_usage
+            encaps_times, encaps_memory_usages = self._discard_throttled(encaps_times, encaps_memory_usages)
+            results.update({
+                'Mean Encapsulation Time': encaps_times.mean(),
+                'Encapsulation Time Standard Deviation': encaps_times.std(),
+                'Maximum Encapsulation Memory Usage': encaps_memory_usages.max(),
+                'Encapsulations Per Second': self._bench_per_second(self.runner.encapsulate, keypair[0]),
+            })
+        else:
+            ciphertext, shared_secret = self.runner.encapsulate(keypair[0])
 
         # Decrypt
-        decaps_times = np.zeros(self.X)
-        decaps_memory_usages = np.zeros(self.X)
-        for i in range(self.X):
-            shared_secret_2, decaps_memory_usage = self._monitor_crypto_func(self.runner.decapsulate, keypair[1], ciphertext)
-            decaps_times[i] = self.runner.decrypt_time
-            decaps_memory_usages[i] = decaps_memory_usage
-        decaps_time_mean = decaps_times.mean()
-        decaps_time_std_div = decaps_times.std()
-        decaps_memory_usage_max = decaps_memory_usages.max()
-        decapsulations_per_second = self._bench_per_second(self.runner.decapsulate, keypair[1], ciphertext)
-        assert shared_secret_2 == shared_secret
-            
+        if self._measures('decaps'):
+            self._phase('Decapsulation')
+            decaps_times = np.zeros(self.X)
+            decaps_memory_usages = np.zeros(self.X)
+            for i in range(self.X):
+                shared_secret_2, decaps_memory_usage = self._monitor_crypto_func(self.runner.decapsulate, keypair[1], ciphertext)
+                decaps_times[i] = self.runner.decrypt_time
+                decaps_memory_usages[i] = decaps_memory_usage
+            decaps_times, decaps_memory_usages = self._discard_throttled(decaps_times, decaps_memory_usages)
+            results.update({
+                'Mean Decapsulation Time': decaps_times.mean(),
+                'Decapsulation Time Standard Deviation': decaps_times.std(),
+                'Maximum Decapsulation Memory Usage': decaps_memory_usages.max(),
+                'Decapsulations Per Second': self._bench_per_second(self.runner.decapsulate, keypair[1], ciphertext),
+            })
+            assert shared_secret_2 == shared_secret
 
-        return pd.DataFrame({
-            'Mean Keygen Time': keygen_time_mean,
-            'Keygen Time Standard Deviation': keygen_time_std_div,
-            'Maximum Keygen Memory Usage': keygen_memory_usage_max,
-            'Mean Encapsulation Time': encaps_time_mean,
-            'Encapsulation Time Standard Deviation': encaps_time_std_div,
-            'Maximum Encapsulation Memory Usage': encaps_memory_usage_max,
-            'Encapsulations Per Second': decapsulations_per_second,
-            'Mean Decapsulation Time': decaps_time_mean,
-            'Decapsulation Time Standard Deviation': decaps_time_std_div,
-            'Maximum Decapsulation Memory Usage': decaps_memory_usage_max,
-            'Decapsulations Per Second': decapsulations_per_second,
-            'Public Key length': pubkey_length,
-            'Secret Key length': secretkey_length,
-            'Ciphertext length': ciphertext_length,
-        }, index=[self.variant])
+        results.update({
+            'Public Key length': len(keypair[0]),
+            'Secret Key length': len(keypair[1]),
+            'Ciphertext length': len(ciphertext),
+        })
+        return pd.DataFrame(results, index=[self.variant])
 
 
 class SignTestRunner(TestRunner):
@@ -128,59 +256,823 @@ class SignTestRunner(TestRunner):
         self.runner = SIG_RUNNERS[runner](algorithm, variant)
     
     def test(self) -> pd.DataFrame:
+        # Operations left out are still run once, untimed, for their outputs
+        results = {}
+
         # Keygen
-        keygen_times = np.zeros(self.X)
-        keygen_memory_usages = np.zeros(self.X)
-        for i in range(self.X):
-            keypair, keygen_memory_usage = self._monitor_crypto_func(self.runner.generate_key)
-            keygen_times[i] = self.runner.keygen_time
-            keygen_memory_usages[i] = keygen_memory_usage
-        keygen_time_mean = keygen_times.mean()
-        keygen_time_std_div = keygen_times.std()
-        keygen_memory_usage_max = keygen_memory_usages.max()
-        pubkey_length = len(keypair[0])
-        secretkey_length = len(keypair[1])
+        if self._measures('keygen'):
+            self._phase('Keygen')
+            keygen_times = np.zeros(self.X)
+            keygen_memory_usages = np.zeros(self.X)
+            for i in range(self.X):
+                keypair, keygen_memory_usage = self._monitor_crypto_func(self.runner.generate_key)
+                keygen_times[i] = self.runner.keygen_time
+                keygen_memory_usages[i] = keygen_memory_usage
+            keygen_times, keygen_memory_usages = self._discard_throttled(keygen_times, keygen_memory_usages)
+            results.update({
+                'Mean Keygen Time': keygen_times.mean(),
+                'Keygen Time Standard Deviation': keygen_times.std(),
+                'Maximum Keygen Memory Usage': keygen_memory_usages.max(),
+            })
+        else:
+            keypair = self.runner.generate_key()
 
         # Sign
         plaintext = random.bytes(64)
-        sign_times = np.zeros(self.X)
-        sign_memory_usages = np.zeros(self.X)
-        for i in range(self.X):
-            signature, sign_memory_usage = self._monitor_crypto_func(self.runner.sign, keypair[1], plaintext)
-            sign_times[i] = self.runner.sign_time
-            sign_memory_usages[i] = sign_memory_usage
-        sign_time_mean = sign_times.mean()
-        sign_time_std_div = sign_times.std()
-        sign_memory_usage_max = sign_memory_usages.max()
-        signature_length = len(signature)
-        signatures_per_second = self._bench_per_second(self.runner.sign, keypair[1], plaintext)
+        if self._measures('sign'):
+            self._phase('Signing')
+            sign_times = np.zeros(self.X)
+            sign_memory_usages = np.zeros(self.X)
+            for i in range(self.X):
+                signature, sign_memory_usage = self._monitor_crypto_func(self.runner.sign, keypair[1], plaintext)
+                sign_times[i] = self.runner.sign_time
+                sign_memory_usages[i] = sign_memory_usage
+            sign_times, sign_memory_usages = self._discard_throttled(sign_times, sign_memory_usages)
+            results.update({
+                'Mean Encapsulation Time': sign_times.mean(),
+                'Encapsulation Time Standard Deviation': sign_times.std(),
+                'Maximum Keygen Memory Usage': sign_memory_usages.max(),
+                'Signatures Per Second': self._bench_per_second(self.runner.sign, keypair[1], plaintext),
+            })
+        else:
+            signature = self.runner.sign(keypair[1], plaintext)
 
         # Verify
+        if self._measures('verify'):
+            self._phase('Verification')
+            verify_times = np.zeros(self.X)
+            verify_memory_usages = np.zeros(self.X)
+            for i in range(self.X):
+                verified, verify_memory_usage = self._monitor_crypto_func(self.runner.verify, keypair[0], plaintext, signature)
+                verify_times[i] = self.runner.verify_time
+                verify_memory_usages[i] = verify_memory_usage
+            verify_times, verify_memory_usages = self._discard_throttled(verify_times, verify_memory_usages)
+            results.update({
+                'Mean Verification Time': verify_times.mean(),
+                'Verification Time Standard Deviation': verify_times.std(),
+                'Maximum Verification Memory Usage': verify_memory_usages.max(),
+                'Verifications Per Second': self._bench_per_second(self.runner.verify, keypair[0], plaintext, signature),
+            })
+            assert verified
+
+        results.update({
+            'Public Key length': len(keypair[0]),
+            'Secret Key length': len(keypair[1]),
+            'Signature length': len(signature),
+        })
+        return pd.DataFrame(results, index=[self.variant])
+
+
+class BatchSignTestRunner(TestRunner):
+    BATCH_SIZES = [1, 16, 256, 4096]
+    X = 20
+
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.runner = BatchSignRunner(SIG_RUNNERS[runner](algorithm, variant))
+
+    def _verify_batch(self, public_key, plaintexts, proofs, batch_signature) -> bool:
+        # Every batch pays for exactly one root verification
+        self.runner.clear_cache()
+        return all(self.runner.verify(public_key, plaintext, proof, batch_signature) for plaintext, proof in zip(plaintexts, proofs))
+
+    def test(self) -> pd.DataFrame:
+        public_key, secret_key = self.runner.generate_key()
+
+        results = []
+        for batch_size in self.BATCH_SIZES:
+            plaintexts = [random.bytes(64) for _ in range(batch_size)]
+
+            # Sign
+            sign_times = np.zeros(self.X)
+            sign_memory_usages = np.zeros(self.X)
+            for i in range(self.X):
+                (batch_signature, proofs), sign_memory_usage = self._monitor_crypto_func(self.runner.sign_batch, secret_key, plaintexts)
+                sign_times[i] = self.runner.sign_time
+                sign_memory_usages[i] = sign_memory_usage
+            sign_times, sign_memory_usages = self._discard_throttled(sign_times, sign_memory_usages)
+            batches_per_second = self._bench_per_second(self.runner.sign_batch, secret_key, plaintexts)
+
+            # Verify
+            cold_verify_times = np.zeros(self.X)
+            cached_verify_times = np.zeros(batch_size)
+            for i in range(self.X):
+                self.runner.clear_cache()
+                verified = self.runner.verify(public_key, plaintexts[0], proofs[0], batch_signature)
+                cold_verify_times[i] = self.runner.verify_time
+                assert verified
+            for i in range(batch_size):
+                verified = self.runner.verify(public_key, plaintexts[i], proofs[i], batch_signature)
+                cached_verify_times[i] = self.runner.verify_time
+                assert verified
+            verified_batches_per_second = self._bench_per_second(self._verify_batch, public_key, plaintexts, proofs, batch_signature)
+
+            signature_length = len(batch_signature[2])
+            mean_proof_length = np.mean([proof_length(proof) for proof in proofs])
+            # Root, batch size and signature are shared by the whole batch
+            shared_length = len(batch_signature[0]) + INDEX_SIZE + signature_length
+
+            results.append(pd.DataFrame({
+                'Batch Size': batch_size,
+                'Mean Batch Signing Time': sign_times.mean(),
+                'Batch Signing Time Standard Deviation': sign_times.std(),
+                'Maximum Batch Signing Memory Usage': sign_memory_usages.max(),
+                'Amortized Signatures Per Second': batches_per_second * batch_size,
+                'Mean Cold Verification Time': cold_verify_times.mean(),
+                'Mean Cached Verification Time': cached_verify_times.mean(),
+                'Amortized Verifications Per Second': verified_batches_per_second * batch_size,
+                'Signature length': signature_length,
+                'Mean Proof length': mean_proof_length,
+                'Per-Message Bytes': mean_proof_length + shared_length / batch_size,
+            }, index=[self.variant]))
+        return pd.concat(results)
+
+
+class _DiscardingWriter(io.RawIOBase):
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return len(data)
+
+
+class HybridTestRunner(TestRunner):
+    MESSAGE_SIZES = [1024, 64 * 1024, 1024 * 1024, 16 * 1024 * 1024]
+    X = 10
+
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.kem_runner = KEM_RUNNERS[runner](algorithm, variant)
+
+    def test(self) -> pd.DataFrame:
+        public_key, secret_key = self.kem_runner.generate_key()
+
+        results = []
+        for aead in AEADS:
+            runner = HybridEncryptionRunner(self.kem_runner, aead)
+            for message_size in self.MESSAGE_SIZES:
+                message = random.bytes(message_size)
+
+                # Seal
+                seal_times = np.zeros(self.X)
+                encaps_times = np.zeros(self.X)
+                seal_memory_usages = np.zeros(self.X)
+                for i in range(self.X):
+                    sealed_length, seal_memory_usage = self._monitor_crypto_func(runner.seal, public_key, message, _DiscardingWriter())
+                    seal_times[i] = runner.seal_time
+                    encaps_times[i] = runner.encrypt_time
+                    seal_memory_usages[i] = seal_memory_usage
+                seal_times, encaps_times, seal_memory_usages = self._discard_throttled(seal_times, encaps_times, seal_memory_usages)
+
+                # Open
+                sealed = io.BytesIO()
+                runner.seal(public_key, message, sealed)
+                open_times = np.zeros(self.X)
+                decaps_times = np.zeros(self.X)
+                open_memory_usages = np.zeros(self.X)
+                for i in range(self.X):
+                    sealed.seek(0)
+                    opened_length, open_memory_usage = self._monitor_crypto_func(runner.open, secret_key, sealed, _DiscardingWriter())
+                    open_times[i] = runner.open_time
+                    decaps_times[i] = runner.decrypt_time
+                    open_memory_usages[i] = open_memory_usage
+                open_times, decaps_times, open_memory_usages = self._discard_throttled(open_times, decaps_times, open_memory_usages)
+                assert opened_length == message_size
+
+                # Times are in nanoseconds
+                results.append(pd.DataFrame({
+                    'AEAD': aead,
+                    'Message Size': message_size,
+                    'Mean Seal Time': seal_times.mean(),
+                    'Seal Time Standard Deviation': seal_times.std(),
+                    'Maximum Seal Memory Usage': seal_memory_usages.max(),
+                    'Mean Encapsulation Time': encaps_times.mean(),
+                    'Seal Throughput (MB/s)': message_size / seal_times.mean() * 1000,
+                    'Mean Open Time': open_times.mean(),
+                    'Open Time Standard Deviation': open_times.std(),
+                    'Maximum Open Memory Usage': open_memory_usages.max(),
+                    'Mean Decapsulation Time': decaps_times.mean(),
+                    'Open Throughput (MB/s)': message_size / open_times.mean() * 1000,
+                    'KEM Share of Seal Time': encaps_times.mean() / seal_times.mean(),
+                    'KEM Share of Open Time': decaps_times.mean() / open_times.mean(),
+                    'Sealed Overhead': sealed_length - message_size,
+                }, index=[self.variant]))
+        return pd.concat(results)
+
+
+def _flip_bit(data: bytes) -> bytes:
+    corrupted = bytearray(data)
+    bit = random.randint(len(corrupted) * 8)
+    corrupted[bit // 8] ^= 1 << (bit % 8)
+    return bytes(corrupted)
+
+
+class AdversarialTestRunner(TestRunner):
+    # How liboqs (RuntimeError), cryptography (ValueError) and the verifiers reject invalid input
+    REJECTIONS = (ValueError, RuntimeError, InvalidSignature)
+
+    def _accepted(self, func, *args) -> bool:
+        # Explicit rejections surface as exceptions, implicit ones as a wrong result
+        try:
+            return bool(func(*args))
+        except self.REJECTIONS:
+            return False
+
+    @abstractmethod
+    def _server_time(self) -> int:
+        ...
+
+    def _serve(self, server_func, *args) -> Tuple[bool, int]:
+        # The runner times only the primitive, a rejection it raises falls back to timing the whole call
+        start = current_milli_time()
+        try:
+            accepted = bool(server_func(*args))
+        except self.REJECTIONS:
+            return False, current_milli_time() - start
+        return accepted, self._server_time()
+
+    def _measure_attack(self, attack: str, craft, server_func) -> pd.DataFrame:
+        craft_times = np.zeros(self.X)
+        server_times = np.zeros(self.X)
+        accepted = 0
+        for i in range(self.X):
+            start = current_milli_time()
+            args = craft()
+            craft_times[i] = current_milli_time() - start
+            server_accepted, server_times[i] = self._serve(server_func, *args)
+            accepted += server_accepted
+        server_per_second = self._bench_per_second(self._accepted, server_func, *craft())
+
+        return pd.DataFrame({
+            'Attack': attack,
+            'Mean Client Time': craft_times.mean(),
+            'Client Time Standard Deviation': craft_times.std(),
+            'Mean Server Time': server_times.mean(),
+            'Server Time Standard Deviation': server_times.std(),
+            'Server Operations Per Second': server_per_second,
+            'Acceptance Rate': accepted / self.X,
+            'Asymmetry Ratio': server_times.mean() / max(craft_times.mean(), 1),
+        }, index=[self.variant])
+
+
+class AdversarialKEMTestRunner(AdversarialTestRunner):
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.runner = KEM_RUNNERS[runner](algorithm, variant)
+
+    def _server_time(self) -> int:
+        return self.runner.decrypt_time
+
+    def test(self) -> pd.DataFrame:
+        public_key, secret_key = self.runner.generate_key()
+        ciphertext, shared_secret = self.runner.encapsulate(public_key)
+
+        def decapsulates(ciphertext, expected_shared_secret):
+            return self.runner.decapsulate(secret_key, ciphertext) == expected_shared_secret
+
+        # The valid case pays for an honest encapsulation on the client side
+        attacks = {
+            'Valid Ciphertext': lambda: self.runner.encapsulate(public_key),
+            'Random Ciphertext': lambda: (random.bytes(len(ciphertext)), shared_secret),
+            'Bit-Flipped Ciphertext': lambda: (_flip_bit(ciphertext), shared_secret),
+            'Truncated Ciphertext': lambda: (ciphertext[:-1], shared_secret),
+        }
+        return pd.concat([self._measure_attack(attack, craft, decapsulates) for attack, craft in attacks.items()])
+
+
+class AdversarialSignTestRunner(AdversarialTestRunner):
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.runner = SIG_RUNNERS[runner](algorithm, variant)
+
+    def _server_time(self) -> int:
+        return self.runner.verify_time
+
+    def test(self) -> pd.DataFrame:
+        public_key, secret_key = self.runner.generate_key()
+        other_public_key, _ = self.runner.generate_key()
+        plaintext = random.bytes(64)
+        signature = self.runner.sign(secret_key, plaintext)
+
+        def verifies(public_key, signature):
+            return self.runner.verify(public_key, plaintext, signature)
+
+        # The valid case pays for an honest signature on the client side
+        attacks = {
+            'Valid Signature': lambda: (public_key, self.runner.sign(secret_key, plaintext)),
+            'Random Signature': lambda: (public_key, random.bytes(len(signature))),
+            'Corrupted Signature': lambda: (public_key, _flip_bit(signature)),
+            'Wrong Public Key': lambda: (other_public_key, signature),
+        }
+        return pd.concat([self._measure_attack(attack, craft, verifies) for attack, craft in attacks.items()])
+
+
+class ChainTestRunner(TestRunner):
+    X = 50
+    LEAVES = 20
+
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        # Variants describe a chain root first, e.g. "RSA:4096 > Dilithium3 > Falcon-512"
+        super().__init__(algorithm, variant)
+        levels = []
+        for level in variant.split('>'):
+            level_runner, _, level_variant = level.strip().rpartition(':')
+            level_runner = level_runner or runner
+            levels.append((f'{level_runner}:{level_variant}', SIG_RUNNERS[level_runner](algorithm, level_variant)))
+        self.builder = CertificateChainBuilder(levels)
+
+    def _verify_chains(self, verifier: ChainVerifier, chains) -> bool:
+        return all(verifier.verify(chain) for chain in chains)
+
+    def test(self) -> pd.DataFrame:
+        chain = self.builder.build()
+        leaves = [self.builder.issue_leaf() for _ in range(self.LEAVES)]
+
+        # Uncached verification
+        verifier = ChainVerifier(self.builder.runners, [chain[-1]], cache=False)
         verify_times = np.zeros(self.X)
         verify_memory_usages = np.zeros(self.X)
         for i in range(self.X):
-            verified, verify_memory_usage = self._monitor_crypto_func(self.runner.verify, keypair[0], plaintext, signature)
-            verify_times[i] = self.runner.verify_time
+            verified, verify_memory_usage = self._monitor_crypto_func(verifier.verify, chain)
+            verify_times[i] = verifier.verify_time
             verify_memory_usages[i] = verify_memory_usage
-        verify_time_mean = verify_times.mean()
-        verify_time_std_div = verify_times.std()
-        verify_memory_usage_max = verify_memory_usages.max()
-        verifications_per_second = self._bench_per_second(self.runner.verify, keypair[0], plaintext, signature)
-        # assert verified
+            assert verified
+        verify_times, verify_memory_usages = self._discard_throttled(verify_times, verify_memory_usages)
+        verifications_per_second = self._bench_per_second(self._verify_chains, verifier, leaves) * self.LEAVES
+
+        # Cached verification, new leaves under the same intermediates
+        cached_verifier = ChainVerifier(self.builder.runners, [chain[-1]])
+        cached_verify_times = np.zeros(self.X)
+        for i in range(self.X):
+            verified = cached_verifier.verify(leaves[i % self.LEAVES])
+            cached_verify_times[i] = cached_verifier.verify_time
+            assert verified
+        hit_rate = cached_verifier.hits / max(cached_verifier.hits + cached_verifier.misses, 1)
+        cached_verifications_per_second = self._bench_per_second(self._verify_chains, cached_verifier, leaves) * self.LEAVES
 
         return pd.DataFrame({
-            'Mean Keygen Time': keygen_time_mean,
-            'Keygen Time Standard Deviation': keygen_time_std_div,
-            'Maximum Keygen Memory Usage': keygen_memory_usage_max,
-            'Mean Encapsulation Time': sign_time_mean,
-            'Encapsulation Time Standard Deviation': sign_time_std_div,
-            'Maximum Keygen Memory Usage': sign_memory_usage_max,
-            'Signatures Per Second': signatures_per_second,
-            'Mean Verification Time': verify_time_mean,
-            'Verification Time Standard Deviation': verify_time_std_div,
-            'Maximum Verification Memory Usage': verify_memory_usage_max,
+            'Chain Depth': len(chain) - 1,
+            'Chain length': chain_length(chain),
+            'Signature length': sum(len(certificate.signature) for certificate in chain[:-1]),
+            'Public Key length': sum(len(certificate.public_key) for certificate in chain[:-1]),
+            'Mean Verification Time': verify_times.mean(),
+            'Verification Time Standard Deviation': verify_times.std(),
+            'Maximum Verification Memory Usage': verify_memory_usages.max(),
             'Verifications Per Second': verifications_per_second,
-            'Public Key length': pubkey_length,
-            'Secret Key length': secretkey_length,
-            'Signature length': signature_length,
+            'Mean Cached Verification Time': cached_verify_times.mean(),
+            'Cached Verification Time Standard Deviation': cached_verify_times.std(),
+            'Cached Verifications Per Second': cached_verifications_per_second,
+            'Cache Hit Rate': hit_rate,
+            'Cache Speedup': verify_times.mean() / cached_verify_times.mean(),
         }, index=[self.variant])
+
+
+class _SimulatedClock:
+    # Lets ticket lifetimes of hours be exercised without waiting for them
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ResumptionTestRunner(TestRunner):
+    TICKET_LIFETIMES = [60, 600, 7200]
+    CACHE_SIZES = [10, 100, 1000]
+    # More clients than the largest cache holds, so every cache size can evict
+    CLIENTS = 3000
+    # Connections per lifetime and cache size, the same workload for every configuration
+    X = 2000
+    # The connections span SPAN_FACTOR times the longest lifetime, so every lifetime can expire
+    SPAN_FACTOR = 1.2
+    MEMORY_SESSIONS = 10_000
+
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.kem_runner = KEM_RUNNERS[runner](algorithm, variant)
+
+    def _memory_per_session(self) -> float:
+        cache = TicketCache(self.MEMORY_SESSIONS, float('inf'))
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(self.MEMORY_SESSIONS):
+            cache.put(os.urandom(TICKET_ID_SIZE), os.urandom(KEY_SIZE))
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return (after - before) / self.MEMORY_SESSIONS
+
+    @staticmethod
+    def _mean(times: List[int]) -> float:
+        return np.mean(times) if times else np.nan
+
+    @staticmethod
+    def _std(times: List[int]) -> float:
+        return np.std(times) if times else np.nan
+
+    def test(self) -> pd.DataFrame:
+        memory_per_session = self._memory_per_session()
+        arrival_interval = self.SPAN_FACTOR * max(self.TICKET_LIFETIMES) / self.X
+
+        results = []
+        for lifetime in self.TICKET_LIFETIMES:
+            for cache_size in self.CACHE_SIZES:
+                self._phase(f'Lifetime {lifetime}s, Cache Size {cache_size}')
+                clock = _SimulatedClock()
+                runner = ResumptionRunner(self.kem_runner, TicketCache(cache_size, lifetime, clock))
+                tickets = {}
+                full_handshake_times = []
+                resume_times = []
+                memory_usages = np.zeros(self.X)
+                for i in range(self.X):
+                    clock.now += random.exponential(arrival_interval)
+                    client = random.randint(self.CLIENTS)
+                    if client in tickets:
+                        (_, tickets[client]), memory_usages[i] = self._monitor_crypto_func(runner.resume, tickets[client])
+                    else:
+                        (_, tickets[client]), memory_usages[i] = self._monitor_crypto_func(runner.full_handshake)
+                    if runner.resumed:
+                        resume_times.append(runner.resume_time)
+                    else:
+                        full_handshake_times.append(runner.full_handshake_time)
+
+                # Times are in nanoseconds, memory in bytes
+                results.append(pd.DataFrame({
+                    'Ticket Lifetime': lifetime,
+                    'Cache Size': cache_size,
+                    'Connections': self.X,
+                    'Mean Arrival Interval': arrival_interval,
+                    'Resumed Connections': len(resume_times),
+                    'Hit Rate': runner.cache.hit_rate(),
+                    'Expired Tickets': runner.cache.expirations,
+                    'Evicted Tickets': runner.cache.evictions,
+                    'Mean Full Handshake Time': self._mean(full_handshake_times),
+                    'Full Handshake Time Standard Deviation': self._std(full_handshake_times),
+                    'Mean Resumption Time': self._mean(resume_times),
+                    'Resumption Time Standard Deviation': self._std(resume_times),
+                    'Resumption Speedup': self._mean(full_handshake_times) / self._mean(resume_times),
+                    'Mean Connection Time': self._mean(full_handshake_times + resume_times),
+                    'Maximum Handshake Memory Usage': memory_usages.max(),
+                    'Memory Per Cached Session': memory_per_session,
+                    'Cache Memory At Capacity': memory_per_session * cache_size,
+                }, index=[self.variant]))
+        return pd.concat(results)
+
+
+def _run_constrained(test_runner, algorithm: str, variant: str, runner: str, operations: Set[str], budget: BudgetConfig, connection) -> None:
+    # A pipe rather than a queue, so reporting does not need a feeder thread under the limits
+    try:
+        applied = apply_budget(budget)
+        constrained = test_runner(algorithm, variant, runner)
+        constrained.operations = operations
+        connection.send(('OK', applied, constrained.test()))
+    except MemoryError:
+        connection.send(('Out of memory', {}, None))
+    except RecursionError:
+        connection.send(('Stack exhausted', {}, None))
+    except Exception as e:
+        connection.send((f'Failed: {type(e).__name__}: {e}', {}, None))
+
+
+class ConstrainedTestRunner(TestRunner):
+    TIMEOUT = 3600
+
+    def __init__(self, algorithm: str, variant: str, runner: str, test_runner=None, budgets: List[BudgetConfig] = None):
+        super().__init__(algorithm, variant)
+        self.runner = runner
+        self.test_runner = test_runner
+        self.budgets = budgets
+
+    def run(self, isolation: Isolation = None, track_drift: bool = True, telemetry: Telemetry = None) -> pd.DataFrame:
+        # Forking while the drift monitor's thread runs can deadlock the child, and its trace would only describe the idle parent
+        return super().run(isolation, track_drift=False, telemetry=telemetry)
+
+    def _test_budget(self, budget: BudgetConfig) -> Tuple[str, dict, pd.DataFrame]:
+        # Limits cannot be lifted again, so every budget gets a fresh child process
+        context = multiprocessing.get_context('fork')
+        reader, writer = context.Pipe(duplex=False)
+        child = context.Process(target=_run_constrained, args=(self.test_runner, self.algorithm, self.variant, self.runner, self.operations, budget, writer))
+        child.start()
+        writer.close()
+        status, applied, results = None, {}, None
+        if wait([reader, child.sentinel], self.TIMEOUT):
+            try:
+                status, applied, results = reader.recv()
+            except EOFError:
+                # Stack overflows in liboqs and the OOM killer end the child without a report
+                pass
+        else:
+            child.kill()
+            status = 'Timed out'
+        child.join()
+        remove_cgroup(budget, child.pid)
+        reader.close()
+        if status is None:
+            status = f'Killed by signal {-child.exitcode}' if child.exitcode < 0 else f'Exited with {child.exitcode}'
+        return status, applied, results
+
+    def test(self) -> pd.DataFrame:
+        rows = []
+        baseline = None
+        for budget in self.budgets:
+            status, applied, results = self._test_budget(budget)
+            row = results if results is not None else pd.DataFrame(index=[self.variant])
+            row.insert(0, 'Budget', budget['name'])
+            row.insert(1, 'Status', status)
+            for limit, value in applied.items():
+                row[limit] = value
+            if baseline is None:
+                baseline = row
+            time_columns = [column for column in row.columns if column.startswith('Mean ') and column.endswith(' Time') and column in baseline.columns]
+            if results is not None and time_columns:
+                row['Worst Slowdown'] = (row[time_columns] / baseline[time_columns]).max(axis=1)
+            rows.append(row)
+        return pd.concat(rows)
+
+
+class SoakTestRunner(TestRunner):
+    DURATION = 3600
+    OPERATIONS = None
+    WINDOW = 10
+    WARMUP_WINDOWS = 1
+    # Growth per million operations beyond which a leak or slowdown is reported
+    LEAK_THRESHOLD = 1024 * 1024
+    DEGRADATION_THRESHOLD = 0.05
+    # Operation names as used by the operations filter
+    OPERATION_KEYS: Dict[str, str] = {}
+
+    def __init__(self, algorithm: str, variant: str):
+        super().__init__(algorithm, variant)
+        self.windows: pd.DataFrame = None
+
+    @abstractmethod
+    def _operations(self) -> Dict[str, Tuple[object, tuple]]:
+        ...
+
+    def traces(self) -> Dict[str, pd.DataFrame]:
+        traces = super().traces()
+        if self.windows is not None:
+            traces['soak'] = self.windows
+        return traces
+
+    def _soak(self, operation: str, func, args) -> pd.DataFrame:
+        # Runs until DURATION seconds or OPERATIONS calls, sampling once per WINDOW seconds
+        windows = []
+        latencies = []
+        count = 0
+        start_s = time()
+        window_start_s = start_s
+        while True:
+            start = current_milli_time()
+            func(*args)
+            latencies.append(current_milli_time() - start)
+            count += 1
+            now_s = time()
+            done = count >= self.OPERATIONS if self.OPERATIONS else now_s - start_s >= self.DURATION
+            if now_s - window_start_s >= self.WINDOW or done:
+                window_latencies = np.array(latencies)
+                memory = self.process.memory_info()
+                windows.append({
+                    'Operation': operation,
+                    'Elapsed': now_s - start_s,
+                    'Operations': count,
+                    'Window Operations Per Second': len(latencies) / (now_s - window_start_s),
+                    'RSS': memory.rss,
+                    'Open File Descriptors': self.process.num_fds(),
+                    'Median Latency': np.percentile(window_latencies, 50),
+                    'p90 Latency': np.percentile(window_latencies, 90),
+                    'p99 Latency': np.percentile(window_latencies, 99),
+                })
+                latencies = []
+                window_start_s = now_s
+            if done:
+                return pd.DataFrame(windows)
+
+    def _growth(self, windows: pd.DataFrame, column: str) -> float:
+        # Least-squares slope per million operations, ignoring warm-up windows
+        fitted = windows.iloc[self.WARMUP_WINDOWS:] if len(windows) > self.WARMUP_WINDOWS + 1 else windows
+        if len(fitted) < 2:
+            return 0.0
+        return np.polyfit(fitted['Operations'] / 1_000_000, fitted[column], 1)[0]
+
+    def test(self) -> pd.DataFrame:
+        results = []
+        all_windows = []
+        for operation, (func, args) in self._operations().items():
+            if not self._measures(self.OPERATION_KEYS.get(operation, operation)):
+                continue
+            self._phase(f'{operation} Soak')
+            windows = self._soak(operation, func, args)
+            all_windows.append(windows)
+
+            rss_growth = self._growth(windows, 'RSS')
+            median_latency_growth = self._growth(windows, 'Median Latency')
+            initial_median_latency = windows['Median Latency'].iloc[min(self.WARMUP_WINDOWS, len(windows) - 1)]
+            results.append(pd.DataFrame({
+                'Operation': operation,
+                'Operations': windows['Operations'].iloc[-1],
+                'Duration': windows['Elapsed'].iloc[-1],
+                'Initial RSS': windows['RSS'].iloc[0],
+                'Final RSS': windows['RSS'].iloc[-1],
+                'RSS Growth Per Million Operations': rss_growth,
+                'Open File Descriptor Growth Per Million Operations': self._growth(windows, 'Open File Descriptors'),
+                'Initial Median Latency': initial_median_latency,
+                'Final Median Latency': windows['Median Latency'].iloc[-1],
+                'Median Latency Growth Per Million Operations': median_latency_growth,
+                'p99 Latency Growth Per Million Operations': self._growth(windows, 'p99 Latency'),
+                'Leak Suspected': rss_growth > self.LEAK_THRESHOLD,
+                'Degradation Suspected': median_latency_growth > initial_median_latency * self.DEGRADATION_THRESHOLD,
+            }, index=[self.variant]))
+        self.windows = pd.concat(all_windows, ignore_index=True)
+        return pd.concat(results)
+
+
+class KEMSoakTestRunner(SoakTestRunner):
+    OPERATION_KEYS = {'Keygen': 'keygen', 'Encapsulation': 'encaps', 'Decapsulation': 'decaps'}
+
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.runner = KEM_RUNNERS[runner](algorithm, variant)
+
+    def _operations(self) -> Dict[str, Tuple[object, tuple]]:
+        public_key, secret_key = self.runner.generate_key()
+        ciphertext, _ = self.runner.encapsulate(public_key)
+        return {
+            'Keygen': (self.runner.generate_key, ()),
+            'Encapsulation': (self.runner.encapsulate, (public_key,)),
+            'Decapsulation': (self.runner.decapsulate, (secret_key, ciphertext)),
+        }
+
+
+class SignSoakTestRunner(SoakTestRunner):
+    OPERATION_KEYS = {'Keygen': 'keygen', 'Signing': 'sign', 'Verification': 'verify'}
+
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.runner = SIG_RUNNERS[runner](algorithm, variant)
+
+    def _operations(self) -> Dict[str, Tuple[object, tuple]]:
+        public_key, secret_key = self.runner.generate_key()
+        plaintext = random.bytes(64)
+        signature = self.runner.sign(secret_key, plaintext)
+        return {
+            'Keygen': (self.runner.generate_key, ()),
+            'Signing': (self.runner.sign, (secret_key, plaintext)),
+            'Verification': (self.runner.verify, (public_key, plaintext, signature)),
+        }
+
+
+class KeyDirectoryTestRunner(TestRunner):
+    KEY_COUNTS = [10_000, 100_000, 1_000_000]
+    CACHE_SIZES = [0, 1024]
+    # Real key pairs, repeated under distinct ids to fill the directory
+    DISTINCT_KEYS = 16
+    LOOKUPS = 10_000
+    # Larger directories are skipped, a million Classic-McEliece keys alone take 261 GB
+    MAX_DIRECTORY_SIZE = 16 * 1024 ** 3
+    # Lookups follow a Zipf distribution over key ids, so a few peers are hot
+    ZIPF_EXPONENT = 1.2
+    # Must be disk-backed: on tmpfs the whole directory is resident and can exhaust memory
+    DIRECTORY_PATH = Path(__file__).parent / 'results' / 'key_directories'
+    # Space left free on the directory's filesystem after building it
+    FREE_SPACE_MARGIN = 1024 ** 3
+
+    @abstractmethod
+    def _public_keys(self) -> List[bytes]:
+        ...
+
+    @abstractmethod
+    def _operate(self, public_key, index: int) -> int:
+        ...
+
+    def _directory_path(self) -> Path:
+        directory_path = Path(self.DIRECTORY_PATH)
+        directory_path.mkdir(parents=True, exist_ok=True)
+        # The innermost mount holding the path decides where the file lives
+        resolved = directory_path.resolve()
+        mounts = [partition for partition in psutil.disk_partitions(all=True) if Path(partition.mountpoint) in (resolved, *resolved.parents)]
+        if mounts and max(mounts, key=lambda partition: len(partition.mountpoint)).fstype in ('tmpfs', 'ramfs'):
+            warnings.warn(f'{directory_path} is on tmpfs, key directories will be held in memory')
+        return directory_path
+
+    @staticmethod
+    def _key_id(index: int) -> bytes:
+        return index.to_bytes(8, 'big')
+
+    def _mapped_rss(self, path: str) -> int:
+        return sum(mapping.rss for mapping in self.process.memory_maps() if mapping.path == path)
+
+    @staticmethod
+    def _drop_page_cache(path: str) -> None:
+        # Every measurement starts from a cold directory, not from the pages the previous one faulted in
+        with open(path, 'rb') as f:
+            os.fsync(f.fileno())
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def _measure(self, path: str, count: int, cache_size: int) -> dict:
+        self._phase(f'{count} Keys, Cache Size {cache_size}')
+        self._drop_page_cache(path)
+        rss_before = self.process.memory_info().rss
+        key_indices = (random.zipf(self.ZIPF_EXPONENT, self.LOOKUPS) - 1) % count
+        with PublicKeyDirectory(path, cache_size) as directory:
+            lookup_times = np.zeros(self.LOOKUPS)
+            for i, key_index in enumerate(key_indices):
+                public_key = directory.get(self._key_id(int(key_index)))
+                lookup_times[i] = directory.lookup_time
+                # Views are lazy, read the key like the OQS runners do so its pages count as resident
+                bytes(public_key)
+
+            operate_times = np.zeros(self.X)
+            operate_memory_usages = np.zeros(self.X)
+            for i in range(self.X):
+                key_index = int(key_indices[i])
+                public_key = directory.get(self._key_id(key_index))
+                operate_times[i], operate_memory_usages[i] = self._monitor_crypto_func(self._operate, public_key, key_index)
+            del public_key
+            operate_times, operate_memory_usages = self._discard_throttled(operate_times, operate_memory_usages)
+
+            hit_rate = directory.hit_rate()
+            mapped_rss = self._mapped_rss(path)
+            rss_growth = self.process.memory_info().rss - rss_before
+
+        return {
+            'Cache Size': cache_size,
+            'Mean Lookup Time': lookup_times.mean(),
+            'Lookup Time Standard Deviation': lookup_times.std(),
+            'p99 Lookup Time': np.percentile(lookup_times, 99),
+            'Mean Operation Time': operate_times.mean(),
+            'Operation Time Standard Deviation': operate_times.std(),
+            'Maximum Operation Memory Usage': operate_memory_usages.max(),
+            'Cache Hit Rate': hit_rate,
+            'Resident Directory Size': mapped_rss,
+            'RSS Growth': rss_growth,
+        }
+
+    def test(self) -> pd.DataFrame:
+        public_keys = self._public_keys()
+        key_size = len(public_keys[0])
+        directory_path = self._directory_path()
+
+        results = []
+        for count in self.KEY_COUNTS:
+            size = directory_size(count, key_size)
+            if size > self.MAX_DIRECTORY_SIZE:
+                continue
+            if size + self.FREE_SPACE_MARGIN > shutil.disk_usage(directory_path).free:
+                warnings.warn(f'Not enough free space in {directory_path} for {count} {self.variant} keys ({size} bytes), skipping')
+                continue
+            fd, path = tempfile.mkstemp(dir=directory_path)
+            os.close(fd)
+            try:
+                self._phase(f'{count} Keys, Build')
+                start = time()
+                keys = ((self._key_id(i), public_keys[i % len(public_keys)]) for i in range(count))
+                PublicKeyDirectory.create(path, keys, count).close()
+                build_duration = time() - start
+                file_size = os.path.getsize(path)
+                for cache_size in self.CACHE_SIZES:
+                    # Times are in nanoseconds, sizes in bytes
+                    results.append(pd.DataFrame({
+                        'Keys': count,
+                        'Public Key length': key_size,
+                        'Build Duration': build_duration,
+                        'Directory File Size': file_size,
+                        # What holding the same keys as bytes objects would take
+                        'Bytes Objects Size': count * sys.getsizeof(public_keys[0]),
+                        **self._measure(path, count, cache_size),
+                    }, index=[self.variant]))
+            finally:
+                os.remove(path)
+        return pd.concat(results) if results else pd.DataFrame(index=[self.variant])
+
+
+class KEMKeyDirectoryTestRunner(KeyDirectoryTestRunner):
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.runner = KEM_RUNNERS[runner](algorithm, variant)
+
+    def _public_keys(self) -> List[bytes]:
+        return [self.runner.generate_key()[0] for _ in range(self.DISTINCT_KEYS)]
+
+    def _operate(self, public_key, index: int) -> int:
+        self.runner.encapsulate(public_key)
+        return self.runner.encrypt_time
+
+
+class SignKeyDirectoryTestRunner(KeyDirectoryTestRunner):
+    def __init__(self, algorithm: str, variant: str, runner: str):
+        super().__init__(algorithm, variant)
+        self.runner = SIG_RUNNERS[runner](algorithm, variant)
+        self.plaintext = random.bytes(64)
+        self.signatures = []
+
+    def _public_keys(self) -> List[bytes]:
+        public_keys = []
+        for _ in range(self.DISTINCT_KEYS):
+            public_key, secret_key = self.runner.generate_key()
+            public_keys.append(public_key)
+            self.signatures.append(self.runner.sign(secret_key, self.plaintext))
+        return public_keys
+
+    def _operate(self, public_key, index: int) -> int:
+        assert self.runner.verify(public_key, self.plaintext, self.signatures[index % self.DISTINCT_KEYS])
+        return self.runner.verify_time
@@ -0,0 +1,32 @@
+import seaborn as sns
+import pandas as pd
+from matplotlib import pyplot as plt
+
+CSV_TO_OPEN = "oqs_bench/testing/results/pi/kem/drift/FrodoKEM.csv"
+RESULTS_FOLDER = "visualizations/pi/drift/"
+
+# Load data to pandas
+data = pd.read_csv(CSV_TO_OPEN)
+data["Time (s)"] = data["Timestamp"] - data["Timestamp"].min()
+
+sns.set_style("whitegrid")
+
+# Frequency and temperature over the whole run, one line per phase
+fig, ax = plt.subplots(2, figsize=(20, 15), sharex=True)
+sns.scatterplot(x="Time (s)", y="Frequency (MHz)", hue="Phase", style="Throttled", data=data, ax=ax[0], palette="mako", s=10)
+ax[0].title.set_text("CPU Frequency")
+sns.scatterplot(x="Time (s)", y="Temperature (C)", hue="Phase", style="Throttled", data=data, ax=ax[1], palette="mako", s=10, legend=False)
+ax[1].title.set_text("CPU Temperature")
+for variant_start in data.groupby("Variant")["Time (s)"].min():
+    ax[0].axvline(variant_start, color="grey", linewidth=0.5)
+    ax[1].axvline(variant_start, color="grey", linewidth=0.5)
+
+fig.savefig(RESULTS_FOLDER + "frequency and temperature.png")
+
+# Share of throttled samples per variant and phase
+fig, ax = plt.subplots(figsize=(20, 10))
+throttled_data = data.groupby(["Variant", "Phase"])["Throttled"].mean().reset_index()
+ax = sns.barplot(y="Variant", x="Throttled", hue="Phase", data=throttled_data, ax=ax, palette="mako")
+ax.set(xlabel="Fraction of samples throttled", ylabel="Variant")
+
+fig.savefig(RESULTS_FOLDER + "throttling.png")